@@ -8,6 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from knowledge_miner import NeurosymbolicMiner
 from triadic_framework.core.network import TriadicNetwork
+from triadic_framework.core.tracing import ConsoleTracer
 from triadic_framework.core.dimensional_units import UNITS_MAP, M, L, T, I, ONE
 
 class BatchMiner:
@@ -16,7 +17,7 @@ class BatchMiner:
     """
     def __init__(self):
         self.miner = NeurosymbolicMiner()
-        self.network = TriadicNetwork()
+        self.network = TriadicNetwork(tracer=ConsoleTracer())
         
         # Extend UNITS_MAP for the network visualization
         # (The miner has its own parser, but the network needs global units)
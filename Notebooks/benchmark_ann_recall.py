@@ -0,0 +1,60 @@
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from motor_semantico_v1.vector_space import VectorSpace
+from motor_semantico_v1.ann_index import IVFIndex
+
+GLOVE_BIN = "glove.6B.50d.vsb"
+
+def build_space(n_words=200000, dims=50, n_topics=500, seed=0):
+    """
+    Uses the memory-mapped GloVe file when available (see real_world_glove_validation.py),
+    otherwise a clustered synthetic space with the same shape statistics.
+    """
+    if os.path.exists(GLOVE_BIN):
+        print(f"Using real embeddings from {GLOVE_BIN}")
+        return VectorSpace.open_binary(GLOVE_BIN)
+
+    print(f"Generating synthetic space: {n_words} words, {dims}d, {n_topics} topics")
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dims))
+    X = topics[rng.integers(0, n_topics, n_words)] + 0.5 * rng.standard_normal((n_words, dims))
+    vs = VectorSpace()
+    vs.add_words([f"w{i}" for i in range(n_words)], X)
+    return vs
+
+def run_recall_benchmark(k=10, n_queries=500, probes=(1, 2, 4, 8, 16, 32, 64)):
+    print("\n--- ANN RECALL BENCHMARK (IVF vs exact search) ---")
+    vs = build_space()
+
+    start = time.time()
+    index = IVFIndex(vs).train()
+    print(f"Trained {index.n_lists} lists over {len(vs)} words in {time.time() - start:.2f}s")
+
+    rng = np.random.default_rng(1)
+    query_rows = rng.choice(len(vs), size=n_queries, replace=False)
+    queries = [np.asarray(vs.matrix[r]) for r in query_rows]
+
+    # Ground truth (excluding the query word itself, as in analogy search)
+    start = time.time()
+    truth = [set(vs.nearest(q, k=k, exclude=[r])[0].tolist()) for q, r in zip(queries, query_rows)]
+    exact_time = time.time() - start
+    print(f"Exact: {n_queries / exact_time:.0f} queries/sec")
+
+    print(f"\n{'n_probe':<10} | {'Recall@' + str(k):<10} | {'Queries/sec':<12} | {'Speed-up':<8}")
+    print("-" * 50)
+    for n_probe in probes:
+        start = time.time()
+        found = [index.search(q, k=k, exclude=[r], n_probe=n_probe)[0] for q, r in zip(queries, query_rows)]
+        elapsed = time.time() - start
+        recall = np.mean([len(t & set(f.tolist())) / k for t, f in zip(truth, found)])
+        print(f"{n_probe:<10} | {recall:<10.3f} | {n_queries / elapsed:<12.0f} | {exact_time / elapsed:<8.1f}x")
+
+if __name__ == "__main__":
+    run_recall_benchmark()
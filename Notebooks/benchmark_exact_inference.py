@@ -0,0 +1,77 @@
+"""
+benchmark_exact_inference.py v1.0.0 – 2026-10-17
+Float vs fractions.Fraction vs LazyRational on the Riemann sum of calculus_convergence_test.py:
+first as raw arithmetic, then through GenericInferenceEngine (float vs exact=True).
+No SCALE factor: the exact result of the right Riemann sum of v(t) = 2t on [0, 4] is 16(n+1)/n.
+"""
+import sys
+import os
+import time
+from fractions import Fraction
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triadic_framework.core.network import TriadicNetwork
+from triadic_framework.core.generic_inference import GenericInferenceEngine
+from triadic_framework.core.additive_laws import AdditiveLaw
+from triadic_framework.core.rational import LazyRational
+
+def riemann_terms(n):
+    dt = Fraction(4, n)
+    return [(2 * i * dt, dt) for i in range(1, n + 1)]
+
+def raw_sum(terms, zero):
+    total = zero
+    for v, dt in terms:
+        total = total + v * dt
+    return total
+
+def as_fraction(value):
+    return value.to_fraction() if isinstance(value, LazyRational) else Fraction(value)
+
+def build_network(n):
+    net = TriadicNetwork()
+    slices = []
+    for i in range(1, n + 1):
+        # d_i · 1 = 1/1 · v_i · dt_i
+        triad = (f"d_{i}", f"v_{i}", f"dt_{i}", '1')
+        net.G.add_edge(f"v_{i},dt_{i},1", f"d_{i}", triad=triad, a=1, b=1, K=1.0)
+        slices.append(f"d_{i}")
+    return net, AdditiveLaw("Riemann Integral", slices, "Total_Distance")
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run_benchmark(slices=(100, 1000, 10000)):
+    print("\n--- EXACT ARITHMETIC BENCHMARK (Riemann sum of v = 2t, t in [0, 4]) ---")
+    for n in slices:
+        terms = riemann_terms(n)
+        exact = Fraction(16 * (n + 1), n)
+        print(f"\nn = {n} slices (exact = {float(exact)!r})")
+        print(f"{'Mode':<28} | {'Time (ms)':<10} | {'Error':<10}")
+        print("-" * 55)
+
+        for name, number in [("raw float", float), ("raw Fraction", Fraction), ("raw LazyRational", LazyRational.from_value)]:
+            converted = [(number(v), number(dt)) for v, dt in terms]
+            result, elapsed = timed(lambda: raw_sum(converted, number(0)))
+            print(f"{name:<28} | {elapsed * 1000:<10.2f} | {float(abs(as_fraction(result) - exact)):<10.3g}")
+
+        net, law = build_network(n)
+        engine = GenericInferenceEngine(net)
+        engine.additive_laws.append(law)
+        inputs = {}
+        for i, (v, dt) in enumerate(terms, start=1):
+            inputs[f"v_{i}"], inputs[f"dt_{i}"] = v, dt
+        float_inputs = {k: float(x) for k, x in inputs.items()}
+
+        result, elapsed = timed(lambda: engine.solve(float_inputs, "Total_Distance", max_steps=5))
+        print(f"{'engine float':<28} | {elapsed * 1000:<10.2f} | {float(abs(as_fraction(result) - exact)):<10.3g}")
+        result, elapsed = timed(lambda: engine.solve(inputs, "Total_Distance", max_steps=5, exact=True))
+        print(f"{'engine exact (LazyRational)':<28} | {elapsed * 1000:<10.2f} | {float(abs(as_fraction(result) - exact)):<10.3g}")
+        assert result == exact
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,138 @@
+"""
+benchmark_semantic_compressor.py v1.0.0 – 2026-10-17
+Compression ratio and MB/s of SemanticCompressor (.semz) against plain zlib, bz2 and lzma, on the
+repo's test_input.txt files and on larger synthetic corpora. The trained dictionary is learned
+from a separate sample of the same source (the small test files are their own sample), saved
+and reloaded through its hash; it must never compress worse than the untrained (synthetic)
+one, and must beat plain zlib on the corpus whose word frequencies do not follow length.
+Single process (workers=1), so MB/s compare per-core throughput.
+"""
+import sys
+import os
+import io
+import bz2
+import lzma
+import zlib
+import time
+import random
+import tempfile
+import contextlib
+from itertools import accumulate
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pro1'))
+
+from motor_semantico_v1.vector_space import VectorSpace
+from semantic_compressor import SemanticCompressor, train_dictionary, save_dictionary
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GLOVE_BIN = "glove.6B.50d.vsb"
+SYLLABLES = ["ca", "sa", "ra", "ma", "la", "ne", "te", "re", "de", "ci", "si", "li", "no", "lo",
+             "ro", "to", "mu", "pu", "tu", "es", "en", "al", "or", "ión", "ña", "cha", "ble", "tra"]
+
+def synthetic_words(n_words, seed=0, short_first=True):
+    """
+    Words of 1-4 syllables, in Zipf rank order: shortest first (the most frequent words are
+    the shortest, as in running text) or shuffled (frequency independent of length, as in
+    the terminology of a technical corpus).
+    """
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n_words:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    words = sorted(words, key=lambda w: (len(w), w))
+    if not short_first:
+        rng.shuffle(words)
+    return words
+
+def zipf_corpus(path, words, n_bytes, seed):
+    """Words drawn with Zipf frequencies (rank 1 most common), with punctuation and line breaks."""
+    rng = random.Random(seed)
+    cum_weights = list(accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+    size = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while size < n_bytes:
+            sentence = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(5, 20)))
+            line = sentence[0].upper() + sentence[1:] + rng.choice([".", ".", ",", ";", "?"]) + rng.choice([" ", "\n"])
+            f.write(line)
+            size += len(line.encode("utf-8"))
+
+def seed_vocabulary():
+    """Embedding vocabulary used to seed training: GloVe when converted, else the synthetic space."""
+    if os.path.exists(GLOVE_BIN):
+        return list(VectorSpace.open_binary(GLOVE_BIN).vocab)
+    with contextlib.redirect_stdout(io.StringIO()):
+        vs = VectorSpace()
+        vs.load_synthetic_data()
+    return list(vs.vocab)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def mb_per_s(n_bytes, seconds):
+    return n_bytes / (1 << 20) / max(seconds, 1e-9)
+
+def bench_plain(name, module, data):
+    packed, t_c = timed(lambda: module.compress(data))
+    restored, t_d = timed(lambda: module.decompress(packed))
+    assert restored == data
+    return name, len(packed), t_c, t_d
+
+def bench_semz(name, compressor, src, tmp, codec="zlib"):
+    semz, out = os.path.join(tmp, "out.semz"), os.path.join(tmp, "restored.txt")
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, t_c = timed(lambda: compressor.compress(src, semz, codec=codec, workers=1))
+        _, t_d = timed(lambda: compressor.decompress(semz, out, workers=1))
+    with open(src, "rb") as f, open(out, "rb") as g:
+        assert f.read() == g.read()
+    return name, os.path.getsize(semz), t_c, t_d
+
+def run_corpus(label, src, sample, tmp, default, seeds, must_beat_zlib=False):
+    with open(src, "rb") as f:
+        data = f.read()
+    words = train_dictionary(sample, max_words=8192, seed_words=seeds)
+    dictionary = os.path.join(tmp, "trained.semd")
+    digest = save_dictionary(words, dictionary)
+    with contextlib.redirect_stdout(io.StringIO()):
+        trained = SemanticCompressor(dictionary)
+
+    print(f"\n{label}: {len(data)} bytes, trained dictionary {len(words)} words ({digest[:12]})")
+    print(f"{'Method':<22} | {'Size (B)':<10} | {'Ratio':<7} | {'Comp MB/s':<9} | {'Decomp MB/s':<11}")
+    print("-" * 72)
+    rows = [bench_plain("zlib", zlib, data), bench_plain("bz2", bz2, data), bench_plain("lzma", lzma, data),
+            bench_semz("semz synthetic+zlib", default, src, tmp),
+            bench_semz("semz trained+zlib", trained, src, tmp),
+            bench_semz("semz trained+lzma", trained, src, tmp, codec="lzma")]
+    for name, size, t_c, t_d in rows:
+        print(f"{name:<22} | {size:<10} | {len(data) / size:<7.2f} | {mb_per_s(len(data), t_c):<9.2f} | {mb_per_s(len(data), t_d):<11.2f}")
+    sizes = {name: size for name, size, _, _ in rows}
+    assert sizes["semz trained+zlib"] <= sizes["semz synthetic+zlib"], "trained dictionary lost to the default one"
+    if must_beat_zlib:
+        assert sizes["semz trained+zlib"] < sizes["zlib"], "trained dictionary does not beat plain zlib"
+
+def run_benchmark(sizes=(1 << 20, 8 << 20)):
+    print("\n--- SEMANTIC COMPRESSOR BENCHMARK (.semz vs zlib / bz2 / lzma) ---")
+    with contextlib.redirect_stdout(io.StringIO()):
+        default = SemanticCompressor()
+    seeds = seed_vocabulary()
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in (os.path.join(HERE, "pro1", "test_input.txt"), os.path.join(HERE, "test_input.txt")):
+            run_corpus(os.path.relpath(path, HERE), path, path, tmp, default, seeds)
+
+        # Short frequent words: zlib already codes them in a few bits and substitution does not
+        # pay, so training keeps (almost) nothing. Frequency independent of length: it does.
+        for short_first, kind in ((True, "short words most frequent"), (False, "frequency independent of length")):
+            words = synthetic_words(20000, short_first=short_first)
+            sample = os.path.join(tmp, "sample.txt")
+            zipf_corpus(sample, words, 1 << 20, seed=1)
+            for n_bytes in sizes:
+                src = os.path.join(tmp, f"zipf_{n_bytes}.txt")
+                zipf_corpus(src, words, n_bytes, seed=2)
+                run_corpus(f"synthetic Zipf corpus, {kind} ({n_bytes >> 20} MB)", src, sample, tmp, default, seeds,
+                           must_beat_zlib=not short_first)
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -7,13 +7,14 @@ print(">>> SCRIPT IS RUNNING... (If you see this, the file is correct)")
 from triadic_framework.core.network import TriadicNetwork
 from triadic_framework.core.generic_inference import GenericInferenceEngine
 from triadic_framework.core.additive_laws import AdditiveLaw
+from triadic_framework.core.tracing import ConsoleTracer
 import logging
 
 # Turn off logs for clean output
 logging.getLogger().setLevel(logging.ERROR)
 
 def run_high_res_integral():
-    net = TriadicNetwork()
+    net = TriadicNetwork(tracer=ConsoleTracer())
     print("=== UHRT CONVERGENCE TEST (v1.1.2) ===")
     print("Objective: Demonstrate that the Integral is a sum of triads.")
     print("Function: v(t) = 2t")
@@ -55,7 +56,7 @@ def run_high_res_integral():
 
     integral_law = AdditiveLaw("Riemann Integral", slices, "Total_Distance")
 
-    engine = GenericInferenceEngine(net)
+    engine = GenericInferenceEngine(net, tracer=ConsoleTracer())
     engine.additive_laws.append(integral_law)
 
     print("... Solving 100 infinitesimal triads ...")
@@ -7,9 +7,10 @@ Method: Riemann Sum (Temporal Discretization).
 from triadic_framework.core.network import TriadicNetwork
 from triadic_framework.core.generic_inference import GenericInferenceEngine
 from triadic_framework.core.additive_laws import AdditiveLaw
+from triadic_framework.core.tracing import ConsoleTracer
 
 def run_discrete_integral():
-    net = TriadicNetwork()
+    net = TriadicNetwork(tracer=ConsoleTracer())
     print("=== DISCRETE CALCULUS EXPERIMENT (INTEGRATION) ===")
     print("Objective: Integrate v(t) to obtain total distance.")
     print("Function: v(t) = a * t  (with a=2)")
@@ -74,7 +75,7 @@ def run_discrete_integral():
     )
 
     # --- [3] HYBRID ENGINE EXECUTION ---
-    engine = GenericInferenceEngine(net)
+    engine = GenericInferenceEngine(net, tracer=ConsoleTracer())
     engine.additive_laws.append(integral_law)
 
     print("\n--- [3] SOLVING THE INTEGRAL ---")
@@ -0,0 +1,170 @@
+"""
+ann_index.py v0.1
+Búsqueda aproximada de vecinos (coseno) para VectorSpace, en NumPy puro.
+Lógica: IVF (Inverted File). Los vectores normalizados se agrupan con k-means
+esférico en `n_lists` celdas; una consulta sólo recorre las `n_probe` celdas
+cuyo centroide está más cerca.
+
+Perilla recall/velocidad: n_probe (1 = lo más rápido, n_lists = búsqueda exacta).
+"""
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+
+class IVFIndex:
+    def __init__(self, space, n_lists: Optional[int] = None, n_probe: int = 8, seed: int = 0):
+        self.space = space
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._assign = np.empty(0, dtype=np.int32)   # fila -> celda
+        self._order = np.empty(0, dtype=np.int64)    # filas ordenadas por celda (CSR)
+        self._bounds = np.zeros(1, dtype=np.int64)   # inicio de cada celda en _order
+        self._pending: List[List[int]] = []          # altas posteriores al último compactado
+        self._n_pending = 0
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    # --- Entrenamiento ---
+
+    def train(self, sample_size: int = 100000, iterations: int = 10):
+        """
+        K-means esférico sobre una muestra y asignación de todo el vocabulario. n_lists se
+        limita al tamaño de la muestra; el índice queda asignado a `space.index`.
+        """
+        n = len(self.space)
+        if n == 0:
+            raise ValueError("No se puede entrenar un índice sobre un espacio vacío.")
+        rng = np.random.default_rng(self.seed)
+        sample_rows = rng.choice(n, size=max(1, min(sample_size, n)), replace=False)
+        n_lists = min(self.n_lists or max(1, int(4 * np.sqrt(n))), len(sample_rows))
+
+        X = self._unit(self.space.matrix[sample_rows])
+        C = X[rng.choice(len(X), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = self._nearest_centroid(X, C)
+            sums = np.zeros_like(C)
+            np.add.at(sums, labels, X)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Celdas vacías: se re-siembran con puntos al azar de la muestra
+                sums[empty] = X[rng.choice(len(X), size=int(empty.sum()))]
+            C = self._unit(sums)
+
+        self.n_lists = n_lists
+        self.centroids = C.astype(self.space.dtype)
+        self._assign = self._nearest_centroid(self._unit(self.space.matrix), self.centroids).astype(np.int32)
+        self._compact()
+        self.space.index = self
+        return self
+
+    @staticmethod
+    def _unit(X: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        return np.divide(X, norms, out=np.zeros_like(X), where=norms > 0)
+
+    @staticmethod
+    def _nearest_centroid(X: np.ndarray, C: np.ndarray, block: int = 65536) -> np.ndarray:
+        labels = np.empty(len(X), dtype=np.int64)
+        for start in range(0, len(X), block):
+            labels[start:start + block] = (X[start:start + block] @ C.T).argmax(axis=1)
+        return labels
+
+    def _compact(self):
+        """Reconstruye la tabla CSR celda -> filas a partir de las asignaciones."""
+        self._order = np.argsort(self._assign, kind="stable")
+        counts = np.bincount(self._assign, minlength=self.n_lists)
+        self._bounds = np.concatenate([[0], np.cumsum(counts)])
+        self._pending = [[] for _ in range(self.n_lists)]
+        self._n_pending = 0
+
+    # --- Actualización incremental (llamada por VectorSpace.add_word/add_words) ---
+
+    def add(self, rows: Iterable[int]):
+        if not self.trained:
+            return
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        if not len(rows):
+            return
+        n = len(self.space)
+        if n > len(self._assign):
+            grown = np.full(max(n, 2 * len(self._assign)), -1, dtype=np.int32)
+            grown[:len(self._assign)] = self._assign
+            self._assign = grown
+        labels = self._nearest_centroid(self._unit(self.space.matrix[rows]), self.centroids)
+        self._assign[rows] = labels
+        for row, label in zip(rows.tolist(), labels.tolist()):
+            self._pending[label].append(row)
+        self._n_pending += len(rows)
+        if self._n_pending > max(1024, len(self._order) // 10):
+            self._assign = self._assign[:n]
+            self._compact()
+
+    # --- Búsqueda ---
+
+    def search(self, query: np.ndarray, k: int = 1, exclude: Iterable[int] = (),
+               n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Igual que VectorSpace.nearest, pero sólo sobre las celdas sondeadas."""
+        if not self.trained:
+            return self.space.nearest(query, k=k, exclude=exclude)
+        q = np.asarray(query, dtype=self.space.dtype)
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=self.space.dtype)
+
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        cells = np.argpartition(-(self.centroids @ q), n_probe - 1)[:n_probe]
+        parts = [self._order[self._bounds[c]:self._bounds[c + 1]] for c in cells]
+        parts += [np.asarray(self._pending[c], dtype=np.int64) for c in cells if self._pending[c]]
+        candidates = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        # Filas reasignadas desde el último compactado: sólo cuenta su celda actual
+        candidates = candidates[np.isin(self._assign[candidates], cells)]
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        if len(excluded):
+            candidates = candidates[~np.isin(candidates, excluded)]
+
+        norms = self.space.norms[candidates]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = (self.space.matrix[candidates] @ q) / (norms * q_norm)
+        keep = np.isfinite(scores)
+        candidates, scores = candidates[keep], scores[keep]
+
+        k = min(k, len(candidates))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=self.space.dtype)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.lexsort((candidates[best], -scores[best]))]
+        return candidates[best].astype(np.intp), scores[best]
+
+    # --- Persistencia ---
+
+    def save(self, path: str):
+        """Guarda en `path` tal cual (con un fichero abierto np.savez no añade '.npz')."""
+        if not self.trained:
+            raise ValueError("El índice no está entrenado.")
+        with open(path, 'wb') as f:
+            np.savez(f, centroids=self.centroids, assign=self._assign[:len(self.space)],
+                     n_probe=self.n_probe, seed=self.seed)
+
+    @classmethod
+    def load(cls, path: str, space) -> 'IVFIndex':
+        """
+        Carga un índice guardado; las palabras añadidas al espacio después se asignan ahora.
+        Como train(), deja el índice asignado a `space.index` para que siga a add_word.
+        """
+        with open(path, 'rb') as f, np.load(f) as data:
+            centroids = data["centroids"]
+            n_probe, seed = int(data["n_probe"]), int(data["seed"])
+            assign = data["assign"].astype(np.int32)
+        index = cls(space, n_lists=len(centroids), n_probe=n_probe, seed=seed)
+        if len(assign) > len(space):
+            raise ValueError("El índice tiene más filas que el espacio: no corresponden.")
+        index.centroids = centroids.astype(space.dtype)
+        index._assign = assign
+        index._compact()
+        index.add(range(len(assign), len(space)))
+        space.index = index
+        return index
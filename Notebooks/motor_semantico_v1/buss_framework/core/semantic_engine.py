@@ -1,11 +1,15 @@
 """
-semantic_engine.py v0.1
+semantic_engine.py v0.2
 Calcula la Resonancia Triádica (K) en el espacio semántico.
 Lógica: Paralelismo Vectorial.
+
+v0.2: solve_analogy vectorizado (producto matriz-vector + top-k) sobre VectorSpace.nearest.
+      solve_analogies_batch: benchmarks completos con productos matriz-matriz por bloques.
+      resonance_matrix: resonancia de todos los pares de una categoría con un producto de Gram.
 """
 import numpy as np
 from scipy.spatial.distance import cosine
-from typing import Tuple
+from typing import List, Optional, Sequence, Tuple
 
 class SemanticResonanceEngine:
     def __init__(self, space):
@@ -36,24 +40,90 @@ class SemanticResonanceEngine:
         similarity = 1 - cosine(T1, T2)
         return similarity
 
-    def solve_analogy(self, A: str, B: str, C: str) -> str:
+    def resonance_matrix(self, pairs: Sequence[Tuple[str, str]], chunk_size: Optional[int] = None) -> np.ndarray:
+        """
+        Resonancia de todos los pares de pares de una categoría:
+        R[i, j] = calculate_resonance(A_i, B_i, A_j, B_j).
+        Los vectores de transformación T = B - A se calculan y normalizan una sola vez
+        y la matriz completa sale de un producto de Gram U·Uᵀ (por bloques de
+        `chunk_size` filas si se indica, para acotar la memoria temporal).
+        Los pares con palabras desconocidas o sin transformación (A = B) dan 0.0.
+        """
+        lookup = self.space.word_to_index
+        rows = np.array([[lookup.get(a, -1), lookup.get(b, -1)] for a, b in pairs], dtype=np.intp).reshape(-1, 2)
+        known = (rows >= 0).all(axis=1)
+        if not known.all():
+            print(f"Error: {int((~known).sum())} par(es) con palabras que no existen en el vocabulario.")
+
+        # 1. Vectores de Transformación, una vez por par
+        M = self.space.matrix
+        T = np.zeros((len(rows), self.space.dims), dtype=M.dtype)
+        T[known] = M[rows[known, 1]] - M[rows[known, 0]]
+
+        # 2. Normalizados: el coseno de cada pareja es un producto escalar
+        norms = np.linalg.norm(T, axis=1, keepdims=True)
+        U = np.divide(T, norms, out=np.zeros_like(T), where=norms > 0)
+
+        R = np.empty((len(U), len(U)), dtype=U.dtype)
+        step = chunk_size or max(len(U), 1)
+        for start in range(0, len(U), step):
+            R[start:start + step] = U[start:start + step] @ U.T
+        return R
+
+    def solve_analogy(self, A: str, B: str, C: str) -> Optional[str]:
         """
         Resuelve: A es a B como C es a... ¿X?
         X = C + (B - A)
         """
-        va, vb, vc = [self.space.get_vector(x) for x in [A, B, C]]
-        
+        ranked = self.solve_analogy_topk(A, B, C, k=1)
+        return ranked[0][0] if ranked else None
+
+    def solve_analogy_topk(self, A: str, B: str, C: str, k: int = 10,
+                           approximate: bool = False) -> List[Tuple[str, float]]:
+        """
+        Igual que solve_analogy, pero devuelve los k mejores candidatos con su
+        similitud coseno. Un único producto matriz-vector sobre todo el vocabulario;
+        las palabras de la pregunta se excluyen por índice.
+        Con approximate=True usa el índice aproximado del espacio (si lo tiene).
+        """
+        rows = [self.space.word_to_index.get(x) for x in [A, B, C]]
+        if any(r is None for r in rows):
+            return []
+
+        va, vb, vc = [self.space.matrix[r] for r in rows]
+
+        # Vector Objetivo Ideal
         target_vec = vc + (vb - va)
-        
-        best_word = None
-        best_dist = float('inf')
-        
-        for word, vec in self.space.vocab.items():
-            if word in [A, B, C]: continue 
-            
-            dist = cosine(target_vec, vec)
-            if dist < best_dist:
-                best_dist = dist
-                best_word = word
-                
-        return best_word
+
+        # Buscar los vecinos más cercanos (no queremos repetir la pregunta)
+        best_rows, scores = self.space.nearest(target_vec, k=k, exclude=rows, approximate=approximate)
+        return [(self.space.index_to_word[r], float(s)) for r, s in zip(best_rows, scores)]
+
+    def solve_analogies_batch(self, A: Sequence[str], B: Sequence[str], C: Sequence[str], k: int = 1,
+                              memory_budget_mb: float = 256) -> List[List[Tuple[str, float]]]:
+        """
+        Resuelve muchas analogías A[i] : B[i] :: C[i] : ¿X[i]? de una vez.
+        Todos los vectores objetivo se construyen como una sola matriz y se puntúan
+        con productos matriz-matriz por bloques (ver VectorSpace.nearest_batch).
+        Devuelve, por pregunta, la lista ranqueada de (palabra, similitud);
+        lista vacía si alguna palabra de la pregunta no está en el vocabulario.
+        """
+        if not (len(A) == len(B) == len(C)):
+            raise ValueError("A, B y C deben tener la misma longitud.")
+
+        lookup = self.space.word_to_index
+        query_rows = np.array([[lookup.get(a, -1), lookup.get(b, -1), lookup.get(c, -1)]
+                               for a, b, c in zip(A, B, C)], dtype=np.intp).reshape(-1, 3)
+        known = (query_rows >= 0).all(axis=1)
+        rows = query_rows[known]
+
+        M = self.space.matrix
+        targets = M[rows[:, 2]] + (M[rows[:, 1]] - M[rows[:, 0]])
+        best_rows, scores = self.space.nearest_batch(targets, k=k, exclude=rows,
+                                                     memory_budget_mb=memory_budget_mb)
+
+        words = self.space.index_to_word
+        ranked = [[] for _ in range(len(query_rows))]
+        for q, r_row, s_row in zip(np.flatnonzero(known), best_rows, scores):
+            ranked[q] = [(words[r], float(s)) for r, s in zip(r_row, s_row) if r >= 0]
+        return ranked
@@ -1,27 +1,343 @@
 """
-vector_space.py v0.1
+vector_space.py v0.3
 Gestiona el 'Significado' como coordenadas en un espacio n-dimensional.
 Para esta demo, usamos vectores sintéticos 'perfectos' para validar la lógica.
+
+v0.2: Almacenamiento matricial. Todos los vectores viven en una única matriz
+contigua float32 (fila = palabra), con índice palabra -> fila, crecimiento
+amortizado en add_word y normas precalculadas por fila.
+v0.3: Formato binario (.vsb) abierto con np.memmap (arranque casi instantáneo,
+caché de páginas compartida entre procesos) y lector de texto GloVe por bloques.
 """
+import itertools
+import struct
 import numpy as np
-from typing import Dict, List, Optional
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# --- Formato binario (.vsb) ---
+# [cabecera 64 B][matriz float32 n x dims][normas float32 n][offsets uint64 n+1][palabras utf-8]
+_MAGIC = b"VSPACE01"
+_VERSION = 1
+# magic, versión, bytes por valor, n, dims, offset matriz, offset normas, offset vocabulario, bytes vocabulario
+_HEADER = struct.Struct("<8sIIQQQQQQ")
+
+def iter_text_chunks(path: str, chunk_lines: int = 50000) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    Lee un fichero de texto estilo GloVe ('palabra v1 v2 ...') por bloques.
+    Cada bloque se convierte a float32 con un único np.fromstring en lugar de
+    un np.array por palabra. Produce (palabras, matriz) por bloque.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_lines))
+            if not lines:
+                break
+            words, values = [], []
+            for line in lines:
+                word, _, rest = line.partition(' ')
+                if rest.strip():
+                    words.append(word)
+                    values.append(rest)
+            if not words:
+                continue
+            flat = np.fromstring(' '.join(values), dtype=np.float32, sep=' ')
+            if flat.size % len(words):
+                raise ValueError(f"Bloque mal formado en '{path}' (filas de longitud distinta o valores no numéricos).")
+            yield words, flat.reshape(len(words), -1)
+
+def _write_binary(path: str, chunks: Iterable[Tuple[Sequence[str], np.ndarray]]) -> int:
+    """Escribe el formato .vsb en streaming a partir de bloques (palabras, matriz)."""
+    words: List[str] = []
+    norms = []
+    dims = 0
+    with open(path, 'wb') as f:
+        f.write(b"\0" * _HEADER.size)
+        for chunk_words, chunk in chunks:
+            chunk = np.ascontiguousarray(chunk, dtype='<f4')
+            if dims == 0:
+                dims = chunk.shape[1]
+            elif chunk.shape[1] != dims:
+                raise ValueError(f"Dimensión incorrecta en el bloque. Se espera {dims}.")
+            f.write(chunk.tobytes())
+            norms.append(np.linalg.norm(chunk, axis=1).astype('<f4'))
+            words.extend(chunk_words)
+
+        norms_offset = f.tell()
+        if norms:
+            f.write(np.concatenate(norms).tobytes())
+        vocab_offset = f.tell()
+        encoded = [w.encode('utf-8') for w in words]
+        offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+        offsets[1:] = np.cumsum([len(e) for e in encoded])
+        blob = b"".join(encoded)
+        f.write(offsets.tobytes())
+        f.write(blob)
+
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 4, len(words), dims, _HEADER.size,
+                             norms_offset, vocab_offset, len(blob)))
+    return len(words)
+
+def convert_text_to_binary(text_path: str, binary_path: str, chunk_lines: int = 50000) -> int:
+    """
+    Conversión única texto GloVe -> .vsb, con memoria acotada (un bloque a la vez).
+    Devuelve el número de palabras escritas.
+    """
+    return _write_binary(binary_path, iter_text_chunks(text_path, chunk_lines))
+
+class _VocabView(Mapping):
+    """Vista de solo lectura palabra -> vector, compatible con el antiguo dict `vocab`."""
+    def __init__(self, space: 'VectorSpace'):
+        self._space = space
+
+    def __getitem__(self, word: str) -> np.ndarray:
+        return self._space._row(self._space.word_to_index[word])
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._space.word_to_index
+
+    def __iter__(self):
+        return iter(self._space.word_to_index)
+
+    def __len__(self) -> int:
+        return len(self._space.word_to_index)
 
 class VectorSpace:
-    def __init__(self):
-        self.vocab: Dict[str, np.ndarray] = {}
+    def __init__(self, dtype=np.float32, capacity: int = 1024):
+        self.dtype = np.dtype(dtype)
         self.dims = 0
+        self.word_to_index: Dict[str, int] = {}
+        self.index_to_word: List[str] = []
+        self._capacity_hint = capacity
+        self._matrix = np.empty((0, 0), dtype=self.dtype)
+        self._norms = np.empty(0, dtype=self.dtype)
+        self.vocab = _VocabView(self)
+        # Índice aproximado opcional (p. ej. ann_index.IVFIndex); se mantiene al día en add_word
+        self.index = None
+
+    def __len__(self) -> int:
+        return len(self.index_to_word)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Matriz (n_palabras, dims) de los vectores, en orden de inserción."""
+        return self._matrix[:len(self.index_to_word)]
+
+    @property
+    def norms(self) -> np.ndarray:
+        """Norma L2 de cada fila de `matrix`."""
+        return self._norms[:len(self.index_to_word)]
 
     def add_word(self, word: str, vector: List[float]):
         """Añade un concepto al espacio."""
-        v = np.array(vector, dtype=float)
+        v = np.asarray(vector, dtype=self.dtype)
         if self.dims == 0:
             self.dims = len(v)
         elif len(v) != self.dims:
             raise ValueError(f"Dimensión incorrecta para '{word}'. Se espera {self.dims}.")
-        self.vocab[word] = v
+
+        idx = self.word_to_index.get(word)
+        if idx is None:
+            idx = len(self.index_to_word)
+            if idx == self._matrix.shape[0]:
+                self._grow(idx + 1)
+            self.word_to_index[word] = idx
+            self.index_to_word.append(word)
+        self._ensure_writable()
+        self._matrix[idx] = v
+        self._norms[idx] = np.linalg.norm(self._matrix[idx])
+        if self.index is not None:
+            self.index.add([idx])
+
+    def _grow(self, min_rows: int):
+        """Duplica la capacidad (crecimiento amortizado O(1) por palabra)."""
+        n = len(self.index_to_word)
+        capacity = max(min_rows, 2 * self._matrix.shape[0], self._capacity_hint)
+        matrix = np.zeros((capacity, self.dims), dtype=self.dtype)
+        norms = np.zeros(capacity, dtype=self.dtype)
+        if n:
+            matrix[:n] = self._matrix[:n]
+            norms[:n] = self._norms[:n]
+        self._matrix, self._norms = matrix, norms
+
+    def add_words(self, words: Sequence[str], vectors: np.ndarray):
+        """Añade muchas palabras de una vez (una sola copia a la matriz)."""
+        V = np.asarray(vectors, dtype=self.dtype)
+        if not len(words):
+            return
+        if V.ndim != 2 or len(V) != len(words):
+            raise ValueError("Se espera una matriz con una fila por palabra.")
+        if self.dims == 0:
+            self.dims = V.shape[1]
+        elif V.shape[1] != self.dims:
+            raise ValueError(f"Dimensión incorrecta para el bloque. Se espera {self.dims}.")
+
+        n = len(self.index_to_word)
+        new_words: Dict[str, int] = {}
+        rows = np.empty(len(words), dtype=np.intp)
+        for i, word in enumerate(words):
+            idx = self.word_to_index.get(word, new_words.get(word))
+            if idx is None:
+                idx = new_words[word] = n + len(new_words)
+            rows[i] = idx
+        if n + len(new_words) > self._matrix.shape[0]:
+            self._grow(n + len(new_words))
+        else:
+            self._ensure_writable()
+        self.word_to_index.update(new_words)
+        self.index_to_word.extend(new_words)
+        self._matrix[rows] = V
+        self._norms[rows] = np.linalg.norm(self._matrix[rows], axis=1)
+        if self.index is not None:
+            self.index.add(rows)
+
+    def load_text(self, path: str, chunk_lines: int = 50000) -> int:
+        """Carga un fichero de texto estilo GloVe por bloques. Devuelve las palabras leídas."""
+        count = 0
+        for words, chunk in iter_text_chunks(path, chunk_lines):
+            self.add_words(words, chunk)
+            count += len(words)
+        return count
+
+    def save_binary(self, path: str) -> int:
+        """Guarda el espacio en formato .vsb (ver open_binary)."""
+        return _write_binary(path, [(self.index_to_word, self.matrix)] if len(self) else [])
+
+    @classmethod
+    def open_binary(cls, path: str, mmap: bool = True) -> 'VectorSpace':
+        """
+        Abre un fichero .vsb. Con mmap=True la matriz y las normas son np.memmap de
+        solo lectura: no se lee nada hasta que se usa, y varios procesos comparten
+        las mismas páginas. Modificar el espacio lo copia a memoria.
+        """
+        with open(path, 'rb') as f:
+            magic, version, itemsize, n, dims, matrix_offset, norms_offset, vocab_offset, vocab_bytes = \
+                _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"'{path}' no es un fichero VectorSpace binario.")
+            if version != _VERSION or itemsize != 4:
+                raise ValueError(f"Versión de formato no soportada en '{path}': {version}.")
+            f.seek(vocab_offset)
+            offsets = np.fromfile(f, dtype='<u8', count=n + 1).tolist()
+            blob = f.read(vocab_bytes)
+
+        space = cls(dtype=np.float32)
+        if n == 0:
+            return space
+        if mmap:
+            space._matrix = np.memmap(path, dtype='<f4', mode='r', offset=matrix_offset, shape=(n, dims))
+            space._norms = np.memmap(path, dtype='<f4', mode='r', offset=norms_offset, shape=(n,))
+        else:
+            space._matrix = np.fromfile(path, dtype='<f4', count=n * dims, offset=matrix_offset).reshape(n, dims)
+            space._norms = np.fromfile(path, dtype='<f4', count=n, offset=norms_offset)
+        space.dims = dims
+        space.index_to_word = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n)]
+        space.word_to_index = {w: i for i, w in enumerate(space.index_to_word)}
+        return space
+
+    def _ensure_writable(self):
+        # Espacio abierto desde disco (memmap de solo lectura): se copia a memoria al modificarlo
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix)
+            self._norms = np.array(self._norms)
+
+    def _row(self, idx: int) -> np.ndarray:
+        row = self._matrix[idx]
+        row.flags.writeable = False  # vista: no debe modificarse por fuera de add_word
+        return row
 
     def get_vector(self, word: str) -> Optional[np.ndarray]:
-        return self.vocab.get(word)
+        idx = self.word_to_index.get(word)
+        if idx is None:
+            return None
+        return self._row(idx)
+
+    def nearest(self, query: np.ndarray, k: int = 1, exclude: Iterable[int] = (),
+                approximate: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vecinos más cercanos por similitud coseno contra todo el vocabulario:
+        un único producto matriz-vector + argpartition (top-k).
+        Devuelve (filas, similitudes) ordenadas de mayor a menor similitud.
+        `exclude` son filas que nunca se devuelven (p. ej. las palabras de la pregunta).
+        Con approximate=True y un índice asignado en `self.index`, delega en él.
+        """
+        if approximate and self.index is not None:
+            return self.index.search(query, k=k, exclude=exclude)
+        q = np.asarray(query, dtype=self.dtype)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = (self.matrix @ q) / (self.norms * np.linalg.norm(q))
+        scores[np.isnan(scores)] = -np.inf  # vectores nulos: nunca son vecinos
+        excluded = list(exclude)
+        if excluded:
+            scores[excluded] = -np.inf
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=scores.dtype)
+        rows = np.argpartition(-scores, k - 1)[:k]
+        rows = rows[np.lexsort((rows, -scores[rows]))]  # empates: gana la fila más antigua
+        rows = rows[np.isfinite(scores[rows])]
+        return rows, scores[rows]
+
+    def nearest_batch(self, queries: np.ndarray, k: int = 1, exclude: Optional[np.ndarray] = None,
+                      memory_budget_mb: float = 256) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Versión por lotes de nearest: puntúa muchas consultas con productos
+        matriz-matriz por bloques, de modo que la matriz de similitudes de un
+        bloque (consultas x vocabulario) no supere `memory_budget_mb`.
+        `exclude` es una matriz (n_consultas, e) de filas prohibidas por consulta
+        (-1 = sin exclusión). Devuelve (filas, similitudes) de forma (n_consultas, k);
+        las posiciones sin candidato válido llevan fila -1 y similitud -inf.
+        """
+        Q = np.atleast_2d(np.asarray(queries, dtype=self.dtype))
+        n_q, n = len(Q), len(self)
+        k = min(k, n)
+        out_rows = np.full((n_q, k), -1, dtype=np.intp)
+        out_scores = np.full((n_q, k), -np.inf, dtype=self.dtype)
+        if k <= 0 or n_q == 0:
+            return out_rows, out_scores
+
+        # Normas inversas: las filas/consultas nulas quedan a 0 y se vetan aparte
+        q_norms = np.linalg.norm(Q, axis=1)
+        with np.errstate(divide="ignore"):
+            inv_norms = np.where(self.norms > 0, 1 / self.norms, 0).astype(self.dtype)
+            q_inv = np.where(q_norms > 0, 1 / q_norms, 0).astype(self.dtype)
+        null_rows = np.flatnonzero(self.norms == 0)
+
+        # Dos matrices (bloque x vocabulario) vivas a la vez: producto y top-k
+        block = max(1, int(memory_budget_mb * 2**20 // (2 * n * self.dtype.itemsize)))
+        for start in range(0, n_q, block):
+            stop = min(start + block, n_q)
+            scores = Q[start:stop] @ self.matrix.T
+            scores *= inv_norms[None, :]
+            scores *= q_inv[start:stop, None]
+            scores[:, null_rows] = -np.inf
+            scores[q_inv[start:stop] == 0] = -np.inf
+            if exclude is not None:
+                ex = np.asarray(exclude)[start:stop]
+                r, c = np.nonzero(ex >= 0)
+                scores[r, ex[r, c]] = -np.inf
+
+            if k <= 8:
+                # k pasadas de argmax: más barato que argpartition para k pequeño,
+                # y el empate lo gana la fila más antigua
+                rows = np.empty((stop - start, k), dtype=np.intp)
+                top = np.empty((stop - start, k), dtype=self.dtype)
+                lines = np.arange(stop - start)
+                for j in range(k):
+                    rows[:, j] = scores.argmax(axis=1)
+                    top[:, j] = scores[lines, rows[:, j]]
+                    scores[lines, rows[:, j]] = -np.inf
+            else:
+                rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                top = np.take_along_axis(scores, rows, axis=1)
+                order = np.lexsort((rows, -top), axis=1)
+                rows = np.take_along_axis(rows, order, axis=1)
+                top = np.take_along_axis(top, order, axis=1)
+            rows[~np.isfinite(top)] = -1
+            out_rows[start:stop], out_scores[start:stop] = rows, top
+        return out_rows, out_scores
 
     def load_synthetic_data(self):
         """
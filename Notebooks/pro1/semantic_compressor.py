@@ -1,95 +1,645 @@
 import sys
 import os
+import re
+import bz2
+import lzma
 import zlib
+import codecs
 import struct
+import hashlib
 import argparse
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 
 # Add parent directory to path to import motor_semantico_v1
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from motor_semantico_v1.vector_space import VectorSpace
 
+# .semz container v2 (files without the magic are read as the original bare zlib format):
+#   header   MAGIC | version | codec | vocab hash (first 8 B) | varint table size | rank table
+#   blocks   codec-compressed payloads, each decodable on its own, back to back
+#   footer   index: varint block count, then varint compressed size and text size per block
+#            | index size (uint32)
+# Block offsets are the running sums of the sizes, so the fixed overhead is 18 bytes plus a
+# few varint bytes per block (v1 spent 32 bytes of header and 16 + 28 per block of footer).
+# Payload: UTF-8 literals; 0xFF + varint(rank + 1) is a word, 0xFF 0x00 a literal 0xFF byte.
+# Ranks follow word frequency in the file, so the 127 most used words take 2 bytes.
+MAGIC = b"SEMZ"
+FORMAT_VERSION = 2
+CODECS = {  # name: (id, compress, decompress, incremental decompressor factory)
+    "zlib": (0, zlib.compress, zlib.decompress, zlib.decompressobj),
+    "bz2": (1, bz2.compress, bz2.decompress, bz2.BZ2Decompressor),
+    "lzma": (2, lzma.compress, lzma.decompress, lzma.LZMADecompressor),
+}
+CODEC_NAMES = {codec_id: name for name, (codec_id, *_) in CODECS.items()}
+_STREAM_CHUNK = 1 << 16                 # read size and output bound of the streaming decoders
+_HEADER = struct.Struct("<4sBB8s")     # MAGIC, version, codec id, vocab hash prefix
+_TRAILER = struct.Struct("<I")          # index size
+
+# Word codes follow the marker, so no byte of a varint may be 0xFF: the last byte holds 7 bits
+# (0x00-0x7F) as usual, continuation bytes hold base-127 digits (0x80-0xFE).
+_VARINT_BASE = 127
+
+def encode_varint(value):
+    out = bytearray()
+    while value > 0x7F:
+        out.append(0x80 | (value % _VARINT_BASE))
+        value //= _VARINT_BASE
+    out.append(value)
+    return bytes(out)
+
+def decode_varint(data, pos=0):
+    value, scale = 0, 1
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        if not byte & 0x80:
+            return value + byte * scale, pos
+        value += (byte & 0x7F) * scale
+        scale *= _VARINT_BASE
+
+# Dictionaries: one word per line under a header naming their hash, which .semz headers store
+DICTIONARY_HEADER = "# semz-dictionary v1"
+_WORD_RE = re.compile(r"[^\W\d_]+")        # letter runs: what the tokenizer can match whole
+
+def vocabulary_hash(words):
+    return hashlib.blake2b("\n".join(words).encode('utf-8'), digest_size=16).digest()
+
+def count_words(paths, chunk_size=1 << 20):
+    """Letter-run counts over one or more UTF-8 files, read in chunks."""
+    counts = Counter()
+    for path in ([paths] if isinstance(paths, (str, os.PathLike)) else paths):
+        with open(path, 'r', encoding='utf-8') as f:
+            # Pieces of a run touching the last chunk end; each chunk is scanned once, so a
+            # long unspaced run (e.g. CJK text) stays linear
+            carry = []
+            for chunk in iter(lambda: f.read(chunk_size), ""):
+                words = _WORD_RE.findall(chunk)
+                if carry and _WORD_RE.match(chunk):
+                    carry.append(words[0])
+                    del words[0]
+                    if not words and _WORD_RE.match(chunk, len(chunk) - 1):
+                        continue
+                if carry:
+                    counts["".join(carry)] += 1
+                    carry = []
+                if words and _WORD_RE.match(chunk, len(chunk) - 1):
+                    carry = [words.pop()]
+                counts.update(words)
+            if carry:
+                counts["".join(carry)] += 1
+    return counts
+
+def train_dictionary(paths, max_words=4096, min_count=2, seed_words=(), chunk_size=1 << 20,
+                     codec="zlib", measure_size=1 << 18):
+    """
+    Picks the words of a sample corpus that save the most bytes under the marker encoding.
+    A word seen c times with a UTF-8 size of L bytes saves c·(L - code) bytes, where code is
+    the marker plus the varint rank (2 bytes for the first 127 words, 3 up to 16383), and costs
+    up to 3 bytes in the rank table. Slots left over go to seed_words (e.g. an embedding
+    vocabulary, which GloVe lists by frequency) in their order, when long enough to pay off.
+
+    Raw savings ignore what the codec already does with repeated words, so the list is then
+    cut to the prefix (0, 16, 32, 64, ... words) whose encoding of the first measure_size
+    characters of the sample is smallest once compressed with `codec`; the shorter prefix
+    wins ties. An empty list means substitution does not pay off on this text.
+    codec=None keeps every candidate.
+    """
+    counts = count_words(paths, chunk_size)
+    sizes = {word: len(word.encode('utf-8')) for word in counts}
+    candidates = sorted((w for w, c in counts.items() if c >= min_count), key=lambda w: (-counts[w] * (sizes[w] - 2), w))
+    words = []
+    for word in candidates:
+        if len(words) >= max_words:
+            break
+        code = 1 + len(encode_varint(len(words) + 1))
+        if counts[word] * (sizes[word] - code) > 3:
+            words.append(word)
+
+    chosen = set(words)
+    for word in seed_words:
+        if len(words) >= max_words:
+            break
+        code = 1 + len(encode_varint(len(words) + 1))
+        if word not in chosen and _WORD_RE.fullmatch(word) and len(word.encode('utf-8')) > code:
+            words.append(word)
+            chosen.add(word)
+    if codec is None or not words:
+        return words
+
+    text = _read_prefix(paths, measure_size)
+    prefixes = [0] + [n for n in (16 << i for i in range(len(words).bit_length())) if n < len(words)] + [len(words)]
+    best = min(prefixes, key=lambda n: (_encoded_size(words[:n], text, codec), n))
+    return words[:best]
+
+def _read_prefix(paths, n_chars):
+    """Up to n_chars characters from the start of the sample files, in order."""
+    parts = []
+    for path in ([paths] if isinstance(paths, (str, os.PathLike)) else paths):
+        with open(path, 'r', encoding='utf-8') as f:
+            parts.append(f.read(n_chars))
+        n_chars -= len(parts[-1])
+        if n_chars <= 0:
+            break
+    return "".join(parts)
+
+def _encoded_size(words, text, codec):
+    """Rank table plus codec-compressed payload of text under the vocabulary `words`."""
+    compressor = SemanticCompressor(words)
+    tokens = list(compressor.tokenize([text]))
+    ranking = compressor.rank_tokens(tokens)
+    table = encode_varint(len(ranking)) + b"".join(encode_varint(word_id) for word_id in ranking)
+    rank_of = {word_id: rank for rank, word_id in enumerate(ranking)}
+    compress = CODECS[codec][1]
+    return len(table) + sum(len(compress(payload)) for payload, _ in compressor.encode_blocks(tokens, rank_of))
+
+def save_dictionary(words, path):
+    """Writes a trained dictionary; returns its hash (hex), as referenced by .semz headers."""
+    words = list(words)
+    digest = vocabulary_hash(words).hex()
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(f"{DICTIONARY_HEADER} {digest}\n")
+        for word in words:
+            f.write(word + "\n")
+    return digest
+
+def load_dictionary(path):
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        header = f.readline().rstrip("\n")
+        words = [line[:-1] if line.endswith("\n") else line for line in f]
+    if not header.startswith(DICTIONARY_HEADER + " "):
+        raise ValueError(f"{path} is not a semz dictionary")
+    if header[len(DICTIONARY_HEADER) + 1:] != vocabulary_hash(words).hex():
+        raise ValueError(f"{path}: dictionary hash does not match its words")
+    return words
+
+def decode_payload(payload, ranked, marker_byte=0xFF):
+    """Payload bytes -> UTF-8 text bytes, given the rank table as encoded words."""
+    parts = payload.split(bytes([marker_byte]))
+    out = [parts[0]]
+    for part in parts[1:]:
+        if part and part[0] < 0x80:  # one-byte code: the most frequent words
+            code, pos = part[0], 1
+        else:
+            code, pos = decode_varint(part)
+        out.append(ranked[code - 1] if code else bytes([marker_byte]))
+        out.append(part[pos:])
+    return b"".join(out)
+
+_VARINT_END = re.compile(rb"[\x00-\x7f]")
+
+class PayloadStream:
+    """
+    decode_payload over a payload that arrives in pieces: a marker whose varint is cut by
+    a piece boundary is held back until the next feed().
+    """
+    def __init__(self, ranked, marker_byte=0xFF):
+        self.ranked = ranked
+        self.marker = bytes([marker_byte])
+        self.marker_byte = marker_byte
+        self.carry = b""
+
+    def feed(self, data):
+        buf = self.carry + data if self.carry else data
+        p = buf.rfind(self.marker)
+        if p != -1 and not _VARINT_END.search(buf, p + 1):
+            buf, self.carry = buf[:p], buf[p:]
+        else:
+            self.carry = b""
+        return decode_payload(buf, self.ranked, self.marker_byte)
+
+    def close(self):
+        if self.carry:
+            raise ValueError("Payload ends inside a word code")
+
+def _inflate(decompressor, chunks, max_length=_STREAM_CHUNK):
+    """
+    Decompressed pieces of at most max_length bytes from an iterator of compressed chunks
+    (zlib decompressobj, BZ2Decompressor and LZMADecompressor).
+    """
+    for data in chunks:
+        while True:
+            out = decompressor.decompress(data, max_length)
+            if out:
+                yield out
+            if hasattr(decompressor, "unconsumed_tail"):
+                data = decompressor.unconsumed_tail
+                if not data:
+                    break
+            else:
+                data = b""
+                if decompressor.needs_input or decompressor.eof:
+                    break
+    if hasattr(decompressor, "flush"):
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+def _read_chunks(f, size, chunk_size=_STREAM_CHUNK):
+    while size > 0:
+        data = f.read(min(chunk_size, size))
+        if not data:
+            raise ValueError("Truncated .semz block")
+        size -= len(data)
+        yield data
+
+# Block workers. Functions live at module level so the process pool can pickle them;
+# the decoder state is sent once per worker through the pool initializer.
+_decoder = None
+
+def _compress_block(codec, payload, text_size):
+    return CODECS[codec][1](payload), text_size
+
+def _init_decoder(codec, ranked, marker_byte):
+    global _decoder
+    _decoder = (CODECS[codec][2], ranked, marker_byte)
+
+def _decode_block(block):
+    decode, ranked, marker_byte = _decoder
+    return decode_payload(decode(block), ranked, marker_byte)
+
+def _map_blocks(func, items, workers, initializer=None, initargs=()):
+    """
+    Ordered map of func over (args) tuples, on a process pool when there is more than one
+    item. At most 2·workers blocks are in flight, so memory stays bounded by block size.
+    """
+    items = iter(items)
+    head = list(islice(items, 2))
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(head) <= 1:
+        if initializer:
+            initializer(*initargs)
+        for args in chain(head, items):
+            yield func(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for args in chain(head, items):
+            pending.append(pool.submit(func, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
 class SemanticCompressor:
-    def __init__(self):
-        self.vs = VectorSpace()
-        self.vs.load_synthetic_data()
+    def __init__(self, vocabulary=None):
+        """
+        vocabulary: a VectorSpace, a word list or the path of a saved dictionary. Default:
+        the synthetic VectorSpace vocabulary (the one legacy files were written with).
+        """
+        self.vs = None
+        if vocabulary is None:
+            self.vs = VectorSpace()
+            self.vs.load_synthetic_data()
+            words = list(self.vs.vocab.keys())
+        elif isinstance(vocabulary, VectorSpace):
+            self.vs = vocabulary
+            words = list(vocabulary.vocab)
+        elif isinstance(vocabulary, (str, os.PathLike)):
+            words = load_dictionary(vocabulary)
+        else:
+            words = list(vocabulary)
         self.marker_byte = 0xFF 
-        self.vocab_list = list(self.vs.vocab.keys())
+        self.set_vocabulary(words)
+
+    def set_vocabulary(self, words):
+        words = list(words)
+        if any("\n" in word for word in words):
+            raise ValueError("Vocabulary words cannot contain newlines")
+        self.vocab_list = words
         self.word_to_id = {word: i for i, word in enumerate(self.vocab_list)}
         self.id_to_word = {i: word for i, word in enumerate(self.vocab_list)}
+        self._build_matcher()
 
-    def compress(self, input_path, output_path):
-        print(f"Compressing {input_path}...")
-        with open(input_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        compressed_stream = bytearray()
-        i = 0
+    def _build_matcher(self):
+        # Character trie of the vocabulary; a terminal stores the word id (= vocab order)
+        self._trie = {}
+        for word_id, word in enumerate(self.vocab_list):
+            if not word:
+                continue
+            node = self._trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node.setdefault(None, word_id)
+        self._max_len = max((len(w) for w in self.vocab_list), default=0)
+        # Zero-width regex that stops only where some word starts, so the Python-level
+        # trie walk runs at candidate positions only
+        self._candidate_re = re.compile("(?=" + self._trie_pattern(self._trie) + ")") if self._trie else None
+
+    @classmethod
+    def _trie_pattern(cls, node):
+        if None in node:
+            return ""  # a word ends here: the position is a candidate either way
+        alts = [re.escape(ch) + cls._trie_pattern(node[ch]) for ch in sorted(node)]
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    def _match(self, text, i, final):
+        """
+        Vocabulary word at text[i]: among the words that start there and are not followed
+        by a letter, the first in vocab order (what scanning vocab_list would pick).
+        """
+        node = self._trie
+        best = None
+        j = i
         n = len(text)
-        while i < n:
-            match_found = False
-            for word in self.vocab_list:
-                if text.startswith(word, i):
-                    end_pos = i + len(word)
-                    if end_pos == n or not text[end_pos].isalpha():
-                        compressed_stream.append(self.marker_byte)
-                        compressed_stream.append(self.word_to_id[word])
-                        i += len(word)
-                        match_found = True
-                        break
-            if not match_found:
-                char_bytes = text[i].encode('utf-8')
-                compressed_stream.extend(char_bytes)
+        while True:
+            word_id = node.get(None)
+            if word_id is not None and (best is None or word_id < best):
+                if (j == n and final) or (j < n and not text[j].isalpha()):
+                    best = word_id
+            if j == n:
+                break
+            node = node.get(text[j])
+            if node is None:
+                break
+            j += 1
+        return best
+
+    def tokenize(self, chunks):
+        """
+        Streams the text as literal spans (str) and word ids (int). Positions are only
+        decided once the next max-word-length + 1 characters are buffered, so the result
+        does not depend on how the input is chunked.
+        """
+        buf = ""
+        for chunk in chunks:
+            buf += chunk
+            consumed, tokens = self._scan(buf, len(buf) - self._max_len, final=False)
+            yield from tokens
+            buf = buf[consumed:]
+        yield from self._scan(buf, len(buf), final=True)[1]
+
+    def _scan(self, buf, limit, final):
+        """Tokens for the positions before `limit`; returns (characters consumed, tokens)."""
+        tokens = []
+        i = start = 0
+        search = self._candidate_re.search if self._candidate_re else None
+        while i < limit:
+            m = search(buf, i) if search else None
+            if m is None or m.start() >= limit:
+                i = limit
+                break
+            i = m.start()
+            word_id = self._match(buf, i, final)
+            if word_id is None:
                 i += 1
-        
-        final_data = zlib.compress(compressed_stream)
-        with open(output_path, 'wb') as f:
-            f.write(final_data)
-        print(f"Done. Original: {os.path.getsize(input_path)}B, Compressed: {len(final_data)}B")
+                continue
+            if start < i:
+                tokens.append(buf[start:i])
+            tokens.append(word_id)
+            i += len(self.vocab_list[word_id])
+            start = i
+        if start < i:
+            tokens.append(buf[start:i])
+            start = i
+        return start, tokens
 
-    def decompress(self, input_path, output_path):
-        print(f"Decompressing {input_path}...")
+    @property
+    def vocab_hash(self):
+        """Identifies the dictionary a .semz file was written with."""
+        return vocabulary_hash(self.vocab_list)
+
+    def save_dictionary(self, path):
+        return save_dictionary(self.vocab_list, path)
+
+    def _read_tokens(self, input_path, chunk_size):
+        with open(input_path, 'r', encoding='utf-8') as src:
+            yield from self.tokenize(iter(lambda: src.read(chunk_size), ""))
+
+    def rank_words(self, input_path, chunk_size=1 << 20):
+        """Vocabulary ids used in the file, most frequent first (ties by vocab order)."""
+        return self.rank_tokens(self._read_tokens(input_path, chunk_size))
+
+    @staticmethod
+    def rank_tokens(tokens):
+        counts = Counter(t for t in tokens if isinstance(t, int))
+        return sorted(counts, key=lambda word_id: (-counts[word_id], word_id))
+
+    def encode_blocks(self, tokens, rank_of, block_size=1 << 20):
+        """Groups tokens into payloads of about block_size bytes: yields (payload, text size)."""
+        marker = bytes([self.marker_byte])
+        word_codes = {word_id: marker + encode_varint(rank + 1) for word_id, rank in rank_of.items()}
+        word_sizes = {word_id: len(self.vocab_list[word_id].encode('utf-8')) for word_id in rank_of}
+        escaped = marker + b"\x00"
+        payload = bytearray()
+        text_size = 0
+        for token in tokens:
+            if isinstance(token, int):
+                payload += word_codes[token]
+                text_size += word_sizes[token]
+            else:
+                data = token.encode('utf-8')
+                text_size += len(data)
+                payload += data.replace(marker, escaped) if self.marker_byte in data else data
+            if len(payload) >= block_size:
+                yield bytes(payload), text_size
+                payload.clear()
+                text_size = 0
+        if payload:
+            yield bytes(payload), text_size
+
+    def compress(self, input_path, output_path, chunk_size=1 << 20, block_size=1 << 20, codec="zlib", workers=None):
+        """
+        Blocks are compressed on `workers` processes (default: all cores).
+        The input is read twice (ranking, then encoding), so it must be a regular file:
+        pipes and other non-seekable inputs raise ValueError before anything is written.
+        """
+        if not os.path.isfile(input_path):
+            raise ValueError(f"{input_path} is not a regular file: compress reads its input twice")
+        print(f"Compressing {input_path}...")
+        codec_id = CODECS[codec][0]
+        # Pass 1 ranks the words by frequency, pass 2 encodes
+        ranking = self.rank_words(input_path, chunk_size)
+        rank_of = {word_id: rank for rank, word_id in enumerate(ranking)}
+
+        with open(output_path, 'wb') as dst:
+            table = encode_varint(len(ranking)) + b"".join(encode_varint(word_id) for word_id in ranking)
+            dst.write(_HEADER.pack(MAGIC, FORMAT_VERSION, codec_id, self.vocab_hash[:8]))
+            dst.write(encode_varint(len(table)) + table)
+            sizes = []
+            payloads = self.encode_blocks(self._read_tokens(input_path, chunk_size), rank_of, block_size)
+            jobs = ((codec, payload, text_size) for payload, text_size in payloads)
+            for block, text_size in _map_blocks(_compress_block, jobs, workers):
+                sizes.append(encode_varint(len(block)) + encode_varint(text_size))
+                dst.write(block)
+            index = encode_varint(len(sizes)) + b"".join(sizes)
+            dst.write(index + _TRAILER.pack(len(index)))
+            size = dst.tell()
+        print(f"Done. Original: {os.path.getsize(input_path)}B, Compressed: {size}B")
+
+    def read_container(self, f):
+        """
+        Parses header and footer of an open .semz file: (codec name, ranked words, index),
+        with one (file offset, compressed size, text offset, text size) entry per block.
+        """
+        f.seek(0)
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a .semz container")
+        _, version, codec_id, vocab_hash = _HEADER.unpack(header)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported .semz version {version}")
+        if codec_id not in CODEC_NAMES:
+            raise ValueError(f"Unknown codec id {codec_id}")
+        if vocab_hash != self.vocab_hash[:8]:
+            raise ValueError(f"The file was compressed with dictionary {vocab_hash.hex()}..., "
+                             f"not with this one ({self.vocab_hash.hex()})")
+
+        # The table size varint takes at most 5 bytes
+        head = f.read(5)
+        table_size, pos = decode_varint(head)
+        f.seek(_HEADER.size + pos)
+        table = f.read(table_size)
+        n_ranked, pos = decode_varint(table)
+        ranked = []
+        for _ in range(n_ranked):
+            word_id, pos = decode_varint(table, pos)
+            ranked.append(self.vocab_list[word_id].encode('utf-8'))
+        data_start = f.tell()
+
+        end = f.seek(0, os.SEEK_END)
+        if end - data_start < _TRAILER.size:
+            raise ValueError("Truncated .semz container (missing footer)")
+        f.seek(end - _TRAILER.size)
+        index_size, = _TRAILER.unpack(f.read(_TRAILER.size))
+        index_offset = end - _TRAILER.size - index_size
+        if index_offset < data_start:
+            raise ValueError("Truncated .semz container (missing footer)")
+        f.seek(index_offset)
+        raw = f.read(index_size)
+        n_blocks, pos = decode_varint(raw)
+        index = []
+        offset, text_offset = data_start, 0
+        for _ in range(n_blocks):
+            size, pos = decode_varint(raw, pos)
+            text_size, pos = decode_varint(raw, pos)
+            index.append((offset, size, text_offset, text_size))
+            offset += size
+            text_offset += text_size
+        if offset != index_offset:
+            raise ValueError("Corrupt .semz container (block sizes do not match the index)")
+        return CODEC_NAMES[codec_id], ranked, index
+
+    def decode_payload(self, payload, ranked):
+        return decode_payload(payload, ranked, self.marker_byte)
+
+    def _read_blocks(self, src, entries):
+        for offset, size, _, _ in entries:
+            src.seek(offset)
+            yield (src.read(size),)
+
+    def decompress_range(self, input_path, start, length, workers=1):
+        """
+        Bytes [start, start + length) of the original UTF-8 text, inflating only the
+        blocks that overlap them (found through the block index).
+        """
+        with open(input_path, 'rb') as src:
+            codec, ranked, index = self.read_container(src)
+            text_starts = [entry[2] for entry in index]
+            first = max(bisect_right(text_starts, start) - 1, 0)
+            last = bisect_right(text_starts, start + length - 1) if length > 0 else first
+            entries = index[first:last]
+            if not entries:
+                return b""
+            blocks = self._read_blocks(src, entries)
+            data = b"".join(_map_blocks(_decode_block, blocks, workers, _init_decoder, (codec, ranked, self.marker_byte)))
+        skip = start - entries[0][2]
+        return data[skip:skip + length]
+
+    def _is_container(self, input_path):
         with open(input_path, 'rb') as f:
-            compressed_data = f.read()
-        try:
-            stream = zlib.decompress(compressed_data)
-        except zlib.error as e:
-            print(f"Error: {e}")
-            return
-
-        decoded_text = []
-        i = 0
-        n = len(stream)
-        while i < n:
-            byte = stream[i]
-            if byte == self.marker_byte:
-                if i + 1 < n:
-                    word_id = stream[i+1]
-                    if word_id in self.id_to_word:
-                        decoded_text.append(self.id_to_word[word_id])
-                        i += 2
-                    else:
-                        decoded_text.append(chr(byte))
-                        i += 1
-                else:
-                    break
+            return f.read(len(MAGIC)) == MAGIC
+
+    def decompress(self, input_path, output_path, workers=None, chunk_size=_STREAM_CHUNK):
+        """
+        Blocks are decoded on `workers` processes (default: all cores). With one worker the
+        output is streamed: memory stays at a few read buffers whatever the block size.
+        """
+        print(f"Decompressing {input_path}...")
+        if not self._is_container(input_path):
+            return self._decompress_legacy(input_path, output_path, chunk_size)
+        workers = workers or os.cpu_count() or 1
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+            codec, ranked, index = self.read_container(src)
+            if workers <= 1 or len(index) <= 1:
+                self._stream_blocks(src, dst, codec, ranked, index, chunk_size)
             else:
-                literal_bytes = bytearray()
-                while i < n and stream[i] != self.marker_byte:
-                    literal_bytes.append(stream[i])
-                    i += 1
-                decoded_text.append(literal_bytes.decode('utf-8'))
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("".join(decoded_text))
+                blocks = self._read_blocks(src, index)
+                for text in _map_blocks(_decode_block, blocks, workers, _init_decoder, (codec, ranked, self.marker_byte)):
+                    dst.write(text)
+        print(f"Restored to {output_path}")
+
+    def _stream_blocks(self, src, dst, codec, ranked, index, chunk_size):
+        new_decompressor = CODECS[codec][3]
+        for offset, size, _, _ in index:
+            src.seek(offset)
+            payload = PayloadStream(ranked, self.marker_byte)
+            for piece in _inflate(new_decompressor(), _read_chunks(src, size, chunk_size), chunk_size):
+                dst.write(payload.feed(piece))
+            payload.close()
+
+    def _decompress_legacy(self, input_path, output_path, chunk_size=_STREAM_CHUNK):
+        """
+        Original format: one zlib stream, 0xFF followed by a one-byte vocab id. Decoded as a
+        stream; a marker cut by a chunk boundary is resolved with the next chunk.
+        """
+        marker = self.marker_byte
+        id_to_word = self.id_to_word
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        pending_marker = False
+        with open(input_path, 'rb') as src, open(output_path, 'w', encoding='utf-8') as dst:
+            chunks = iter(lambda: src.read(chunk_size), b"")
+            try:
+                for data in _inflate(zlib.decompressobj(), chunks, chunk_size):
+                    i, n = 0, len(data)
+                    if pending_marker:
+                        pending_marker = False
+                        word = id_to_word.get(data[0])
+                        dst.write(chr(marker) if word is None else word)
+                        i = 0 if word is None else 1
+                    while i < n:
+                        j = data.find(marker, i)
+                        if j == -1:
+                            dst.write(utf8.decode(data[i:]))
+                            break
+                        # Each literal run is decoded on its own, as the original decoder did
+                        dst.write(utf8.decode(data[i:j], final=True))
+                        if j + 1 == n:
+                            pending_marker = True
+                            break
+                        word = id_to_word.get(data[j + 1])
+                        if word is None:
+                            dst.write(chr(marker))
+                            i = j + 1
+                        else:
+                            dst.write(word)
+                            i = j + 2
+            except zlib.error as e:
+                print(f"Error: {e}")
+                return
+            # A marker as the very last byte is dropped
+            dst.write(utf8.decode(b"", final=True))
         print(f"Restored to {output_path}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument('action', choices=['compress', 'decompress'])
-    parser.add_argument('input')
-    parser.add_argument('output')
+    parser.add_argument('action', choices=['compress', 'decompress', 'train'])
+    parser.add_argument('input', help="text to compress, .semz to decompress, or training sample")
+    parser.add_argument('output', help="output file (the dictionary for train)")
+    parser.add_argument('--codec', choices=sorted(CODECS), default='zlib')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dictionary', help="dictionary saved by train (default: synthetic vocabulary)")
+    parser.add_argument('--max-words', type=int, default=4096)
     args = parser.parse_args()
-    c = SemanticCompressor()
-    if args.action == 'compress': c.compress(args.input, args.output)
-    else: c.decompress(args.input, args.output)
+    if args.action == 'train':
+        words = train_dictionary(args.input, max_words=args.max_words, codec=args.codec)
+        print(f"Trained {len(words)} words -> {args.output} ({save_dictionary(words, args.output)})")
+        sys.exit()
+    c = SemanticCompressor(args.dictionary)
+    if args.action == 'compress': c.compress(args.input, args.output, codec=args.codec, workers=args.workers)
+    else: c.decompress(args.input, args.output, workers=args.workers)
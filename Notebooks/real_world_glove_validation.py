@@ -2,7 +2,6 @@ import os
 import sys
 import urllib.request
 import zipfile
-import numpy as np
 
 # Add parent directory to path to import legacy engine
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -10,16 +9,17 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../motor_semantico_v1')))
 
 try:
-    from motor_semantico_v1.vector_space import VectorSpace
+    from motor_semantico_v1.vector_space import VectorSpace, convert_text_to_binary
     from motor_semantico_v1.semantic_engine import SemanticResonanceEngine
 except ImportError:
     # Fallback if structure is different
-    from buss_framework.core.vector_space import VectorSpace
+    from buss_framework.core.vector_space import VectorSpace, convert_text_to_binary
     from buss_framework.core.semantic_engine import SemanticResonanceEngine
 
 GLOVE_URL = "http://nlp.stanford.edu/data/glove.6B.zip"
 GLOVE_ZIP = "glove.6B.zip"
 GLOVE_FILE = "glove.6B.50d.txt"
+GLOVE_BIN = "glove.6B.50d.vsb"
 
 def download_glove():
     if os.path.exists(GLOVE_FILE):
@@ -52,17 +52,28 @@ def download_glove():
 
 def load_glove_vectors(vector_space, file_path):
     print(f"📖 Loading vectors from {file_path}...")
-    count = 0
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            values = line.split()
-            word = values[0]
-            vector = np.array(values[1:], dtype='float32')
-            vector_space.add_word(word, vector)
-            count += 1
-            if count % 50000 == 0:
-                print(f"   Loaded {count} words...")
+    # Chunked, vectorized parser (one np.fromstring per 50k lines)
+    count = vector_space.load_text(file_path)
     print(f"✅ Loaded {count} words into VectorSpace.")
+    return count
+
+def open_glove_space(file_path, binary_path=GLOVE_BIN):
+    """
+    Converts the text file to the binary format once, then memory-maps it.
+    Later runs (and parallel workers) start almost instantly and share the page cache.
+    With binary_path=None the text file is parsed into memory instead (no file written).
+    """
+    if binary_path is None:
+        vs = VectorSpace()
+        load_glove_vectors(vs, file_path)
+        return vs
+    if not os.path.exists(binary_path):
+        print(f"🔧 Converting {file_path} to binary format ({binary_path}), one-time step...")
+        count = convert_text_to_binary(file_path, binary_path)
+        print(f"✅ Wrote {count} vectors.")
+    vs = VectorSpace.open_binary(binary_path)
+    print(f"✅ Memory-mapped {len(vs)} words from {binary_path}.")
+    return vs
 
 def run_real_world_test():
     print("\n===================================================")
@@ -79,8 +90,7 @@ def run_real_world_test():
         return
 
     # 2. Initialize Engine
-    vs = VectorSpace()
-    load_glove_vectors(vs, GLOVE_FILE)
+    vs = open_glove_space(GLOVE_FILE)
     engine = SemanticResonanceEngine(vs)
 
     # 3. Test Analogy: Man : King :: Woman : ? (Expected: Queen)
@@ -1,8 +1,9 @@
 from triadic_framework.core.network import TriadicNetwork
 from triadic_framework.core.generic_inference import GenericInferenceEngine
+from triadic_framework.core.tracing import ConsoleTracer
 
 # 1. Configurar Red
-net = TriadicNetwork()
+net = TriadicNetwork(tracer=ConsoleTracer())
 print("Building Physics Graph...")
 
 # Triada 1: 2KE = m * v^2
@@ -14,7 +15,7 @@ net.add_candidate_quartet((50, 1, 5, 10), ('2KE', '1', 'm', 'v2'))
 net.add_candidate_quartet((25, 50, 1, 2), ('KE', '2KE', '1', '2'))
 
 # 2. Inferencia
-engine = GenericInferenceEngine(net)
+engine = GenericInferenceEngine(net, tracer=ConsoleTracer())
 inputs = {"m": 5, "v2": 10, "PE": 200} # Nota: No damos KE, debe deducirlo
 target = "E_total"
 
@@ -0,0 +1,64 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triadic_framework.core import concept_mapper
+from triadic_framework.core.concept_mapper import PrimeConceptMapper
+
+def test_exponent_vector_analogy():
+    print("\n--- TEST: King / Man * Woman on exponent vectors ---")
+
+    mapper = PrimeConceptMapper()
+    king, man, woman = (mapper.get_concept_vector(w) for w in ("king", "man", "woman"))
+
+    queen = mapper.multiply_vectors(mapper.divide_vectors(king, man), woman)
+    value = mapper.value_from_vector(queen)
+
+    print(f"Result: {value} -> {mapper.get_concept_name(value)}")
+    assert value == mapper.get_concept_value("queen")
+    assert mapper.get_concept_name(value) == "queen"
+    print("✅ Analogy solved without factoring any integer.")
+
+def test_name_index_incremental():
+    print("\n--- TEST: Reverse lookup index ---")
+
+    mapper = PrimeConceptMapper()
+    values = [mapper.get_concept_value(w) for w in ("man", "queen", "victim")]
+    assert mapper.get_concept_names(values) == ["man", "queen", "victim"]
+
+    # New concepts become visible immediately
+    mapper.add_concept("elder", ["HUMAN", "OLD"])
+    assert mapper.get_concept_name(3 * 43) == "elder"
+
+    # A synonym does not steal the value from the first definition
+    mapper.add_concept("monarch", ["HUMAN", "MALE", "ADULT", "ROYALTY", "LEADER"])
+    assert mapper.get_concept_name(mapper.get_concept_value("king")) == "king"
+
+    # Unknown values still fall back to the factorized description
+    assert mapper.get_concept_name(3 * 7 * 101) == "Composite(HUMAN, OBJECT, UNKNOWN_FACTOR(101))"
+    print("✅ Index stays consistent with the definitions.")
+
+def test_factorization_cache_is_bounded():
+    print("\n--- TEST: Factorization cache ---")
+
+    mapper = PrimeConceptMapper()
+    vec, remainder = mapper.factorize(2 ** 3 * 13 * 101)
+    assert (vec, remainder) == ({0: 3, 5: 1}, 101)
+    vec[0] = 99  # callers get copies, the cache is untouched
+    assert mapper.factorize(2 ** 3 * 13 * 101) == ({0: 3, 5: 1}, 101)
+    girl = mapper.get_concept_value("girl")
+    assert girl in mapper._factorizations  # seeded by value_from_vector, no trial division
+    assert mapper.get_attributes_from_value(girl) == ["HUMAN", "FEMALE", "YOUNG"]
+
+    for value in range(1, 3 * concept_mapper.FACTORIZATION_CACHE_SIZE, 3):
+        mapper.factorize(value)
+    assert len(mapper._factorizations) == concept_mapper.FACTORIZATION_CACHE_SIZE
+    assert girl not in mapper._factorizations and mapper.factorize(girl) == ({1: 1, 5: 1, 11: 1}, 1)
+    print("✅ Factorizations are cached, up to FACTORIZATION_CACHE_SIZE values.")
+
+if __name__ == "__main__":
+    test_exponent_vector_analogy()
+    test_name_index_incremental()
+    test_factorization_cache_is_bounded()
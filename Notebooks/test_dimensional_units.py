@@ -0,0 +1,62 @@
+import sys
+import os
+import pickle
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triadic_framework.core.dimensional_units import (
+    DimensionalUnit, M, L, T, ONE, FORCE, ENERGY, UNITS_MAP, UNKNOWN_UNIT, balance_mask, unit_codes
+)
+
+def test_packed_interned_units():
+    print("\n--- TEST: Packed, interned DimensionalUnit ---")
+
+    assert FORCE.exponents == (1, 1, -2, 0, 0)
+    assert M * L / T**2 is FORCE and DimensionalUnit((1, 1, -2, 0, 0)) is FORCE
+    assert ENERGY / FORCE == L and (L / L) is ONE
+    assert {FORCE: "N", ENERGY: "J"}[M * L * L / (T * T)] == "J"
+    assert pickle.loads(pickle.dumps(FORCE)) is FORCE
+    assert repr(FORCE) == "(1, 1, -2, 0, 0)"
+
+    try:
+        DimensionalUnit((600, 0, 0, 0, 0))
+        assert False, "exponent out of range"
+    except OverflowError:
+        pass
+    # Whole-valued floats are accepted, fractional exponents are not truncated
+    assert L**2.0 is L * L
+    for make in (lambda: L**0.5, lambda: DimensionalUnit((0, 1.5, 0, 0, 0))):
+        try:
+            make()
+            assert False, "fractional exponent"
+        except ValueError:
+            pass
+    print("✅ Units are hashable singletons with the old API.")
+
+def test_balance_mask_matches_scalar():
+    print("\n--- TEST: Vectorized balance_mask ---")
+
+    rng = np.random.default_rng(0)
+    units = [DimensionalUnit(tuple(e)) for e in rng.integers(-3, 4, size=(30, 5))]
+    units += [M, L, T, FORCE, ENERGY]
+    quartets = [tuple(units[i] for i in rng.integers(0, len(units), 4)) for _ in range(2000)]
+    # Force some balanced rows
+    quartets += [(FORCE, M, L / T**2, ONE), (ENERGY, FORCE, L, ONE)]
+
+    codes = np.array([[u.code for u in q] for q in quartets])
+    codes[0, 2] = UNKNOWN_UNIT
+    mask = balance_mask(*codes.T)
+    expected = [(u1 * u4) == (u2 * u3) for u1, u2, u3, u4 in quartets]
+    expected[0] = True
+    assert mask.tolist() == expected and mask[-2:].all()
+
+    labels = [["KE", "m", "v2", "1"], ["KE", "1", "m", "2KE"], ["KE", "zzz", "m", "1"]]
+    assert balance_mask(*unit_codes(labels, UNITS_MAP).T).tolist() == [True, False, True]
+    print("✅ Same verdicts as (u1 * u4) == (u2 * u3), as array operations.")
+
+if __name__ == "__main__":
+    test_packed_interned_units()
+    test_balance_mask_matches_scalar()
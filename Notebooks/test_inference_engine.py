@@ -0,0 +1,326 @@
+import sys
+import os
+import io
+import contextlib
+import json
+from fractions import Fraction
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triadic_framework.core.network import TriadicNetwork
+from triadic_framework.core.additive_laws import AdditiveLaw
+from triadic_framework.core.generic_inference import GenericInferenceEngine, LITERAL
+from triadic_framework.core.rational import LazyRational
+from triadic_framework.core.tracing import ConsoleTracer, MemoryTracer, JsonLinesTracer
+
+def doubling_chain(n, reverse=False):
+    """X_i · 1 = 1/1 · X_{i-1} · 2, inserted forwards or backwards."""
+    net = TriadicNetwork()
+    links = range(1, n + 1)
+    for i in (reversed(links) if reverse else links):
+        triad = (f"X{i}", f"X{i - 1}", "2", "1")
+        net.G.add_edge(f"X{i - 1},2,1", f"X{i}", triad=triad, a=1, b=1, K=1.0)
+    return net
+
+def run_quiet(engine, *args, method="solve", **kwargs):
+    engine.tracer = ConsoleTracer()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        result = getattr(engine, method)(*args, **kwargs)
+    if method == "solve":
+        return result, out.getvalue()
+    return result
+
+def test_worklist_keeps_sweep_order():
+    print("\n--- TEST: Worklist fixpoint vs sweep semantics ---")
+
+    # Forward edges: one sweep propagates the whole chain
+    result, log = run_quiet(GenericInferenceEngine(doubling_chain(5)), {"X0": 1}, "X5")
+    assert result == 32.0 and "SUCCESS IN 2 STEPS! X5 = 32" in log
+
+    # Backward edges: each sweep only advances one link
+    result, log = run_quiet(GenericInferenceEngine(doubling_chain(5, reverse=True)), {"X0": 1}, "X5")
+    assert result == 32.0 and "SUCCESS IN 6 STEPS! X5 = 32" in log
+    assert "Step 3 (Multiplicative): X3 = 8.00" in log
+
+    # Running out of steps or facts behaves as before
+    result, log = run_quiet(GenericInferenceEngine(doubling_chain(5, reverse=True)), {"X0": 1}, "X5", max_steps=3)
+    assert result is None
+    result, log = run_quiet(GenericInferenceEngine(doubling_chain(3)), {"Y": 1}, "X3")
+    assert result is None and "Inference stopped at step 1" in log
+
+    # Step 1 starts from the rules of the given variables, not from every rule
+    class CountingList(list):
+        reads = 0
+        def __getitem__(self, i):
+            CountingList.reads += 1
+            return super().__getitem__(i)
+
+    net = doubling_chain(3)
+    for i in range(5000):
+        net.G.add_edge(f"a{i},b{i},1", f"c{i}", triad=(f"c{i}", f"a{i}", f"b{i}", "1"), a=1, b=1, K=1.0)
+    engine = GenericInferenceEngine(net)
+    engine._rule_index().triads = CountingList(engine._rule_index().triads)
+    assert run_quiet(engine, {"X0": 1}, "X3")[0] == 8.0 and CountingList.reads < 20
+
+    # Numeric triad labels are known to the laws from step 1 on, as after a full sweep
+    net = TriadicNetwork()
+    net.G.add_edge("0,V,1", "U", triad=("U", "0", "V", "1"), a=1, b=1, K=1.0)
+    engine = GenericInferenceEngine(net)
+    engine.additive_laws = [AdditiveLaw("Balance", ["P", "Q"], "0")]
+    assert run_quiet(engine, {"P": 2}, "Q")[0] == -2.0
+    print("✅ Same facts in the same steps as the full sweeps.")
+
+def test_additive_law_wakes_up_triads():
+    print("\n--- TEST: Additive result feeding a triad ---")
+
+    net = TriadicNetwork()
+    # E2 · 1 = 1/1 · E_total · 2 (inserted before the law can fire)
+    net.G.add_edge("E_total,2,1", "E2", triad=("E2", "E_total", "2", "1"), a=1, b=1, K=1.0)
+    result, log = run_quiet(GenericInferenceEngine(net), {"KE": 25, "PE": 200}, "E2")
+
+    assert result == 450.0
+    assert "Step 1 (Additive - Sum): E_total = 225.00" in log
+    assert "Step 2 (Multiplicative): E2 = 450.00" in log
+    print("✅ Only the triad mentioning E_total is revisited.")
+
+def test_backward_chaining_plan():
+    print("\n--- TEST: Goal-directed inference ---")
+
+    net = doubling_chain(50, reverse=True)
+    # 2KE · 1 = 1/1 · m · v2  and  KE · 2 = 1/1 · 2KE · 1
+    net.add_candidate_quartet((50, 1, 5, 10), ('2KE', '1', 'm', 'v2'))
+    net.add_candidate_quartet((25, 50, 1, 2), ('KE', '2KE', '1', '2'))
+    engine = GenericInferenceEngine(net)
+
+    value, plan = run_quiet(engine, {"m": 5, "v2": 10, "PE": 200}, "E_total", method="solve_backward")
+    assert value == 225.0
+    assert [step.output for step in plan] == ["2KE", "2", "KE", "E_total"]
+    assert plan[1].rule == LITERAL and plan[-1].premises == ("KE", "PE")
+    # The doubling chain is never touched
+    assert not any(step.output.startswith("X") for step in plan)
+
+    # Same answer as the forward sweep, also through a long chain
+    forward, _ = run_quiet(engine, {"X0": 1}, "X50", max_steps=60)
+    backward, plan = run_quiet(engine, {"X0": 1}, "X50", method="solve_backward")
+    assert forward == backward == 2.0 ** 50 and len(plan) == 51
+
+    value, plan = run_quiet(engine, {"m": 5}, "E_total", method="solve_backward")
+    assert value is None
+    print("✅ Only the relevant rules fire, and the plan records them in order.")
+
+def test_backward_chaining_long_chain():
+    print("\n--- TEST: Goal-directed inference on a 1000-link chain ---")
+
+    # Deeper than the interpreter's recursion limit allows for a recursive proof
+    engine = GenericInferenceEngine(doubling_chain(1000, reverse=True))
+    value, plan = engine.solve_backward({"X0": 1}, "X1000")
+    assert value == 2.0 ** 1000 and plan[-1].output == "X1000"
+    assert engine.solve_backward({"X0": 1}, "X1000", exact=True)[0] == 2 ** 1000
+    assert engine.compile(["X0"], "X1000").execute({"X0": 1}) == value
+    assert engine.session({"X0": 1}).get("X1000") == value
+    print("✅ solve_backward, compile and sessions handle long derivations.")
+
+def test_compiled_plan_replay():
+    print("\n--- TEST: Compiled plans ---")
+
+    net = TriadicNetwork()
+    net.add_candidate_quartet((50, 1, 5, 10), ('2KE', '1', 'm', 'v2'))
+    net.add_candidate_quartet((25, 50, 1, 2), ('KE', '2KE', '1', '2'))
+    engine = GenericInferenceEngine(net)
+
+    plan = engine.compile(["v2", "m", "PE"], "E_total")
+    assert engine.compile(["m", "PE", "v2"], "E_total") is plan  # schema order is irrelevant
+    assert len(plan) == 4
+
+    for m, v2, pe in [(5, 10, 200), (2.5, 3, 0), (7, 0.5, -1)]:
+        inputs = {"m": m, "v2": v2, "PE": pe}
+        expected, _ = run_quiet(engine, inputs, "E_total")
+        assert plan.execute(inputs) == expected
+
+    m = np.array([5.0, 2.5, 7.0])
+    column = plan.execute_batch({"m": m, "v2": np.array([10.0, 3.0, 0.5]), "PE": np.array([200.0, 0.0, -1.0])})
+    assert np.array_equal(column, [225.0, 3.75, 0.75])
+
+    # Division by zero: None for a scalar replay, NaN for the row in a batch
+    ratio = engine.compile(["KE", "m"], "v2")
+    assert ratio.execute({"KE": 25, "m": 0}) is None
+    assert np.isnan(ratio.execute_batch({"KE": np.array([25.0, 25.0]), "m": np.array([0.0, 5.0])})).tolist() == [True, False]
+
+    # A new triad invalidates the cached plans
+    net.add_candidate_quartet((2, 1, 2, 1), ('p', '1', 'q', '1'))
+    assert engine.compile(["v2", "m", "PE"], "E_total") is not plan
+    try:
+        engine.compile(["m"], "E_total")
+        assert False, "E_total is not derivable from m alone"
+    except ValueError:
+        pass
+
+    # Direct edits to G that keep the edge count (in-place ratio change, rewired edge) also invalidate
+    chain = doubling_chain(3)
+    chain_engine = GenericInferenceEngine(chain)
+    doubling = chain_engine.compile(["X0"], "X3")
+    assert doubling.execute({"X0": 1}) == 8.0
+    chain.G.edges["X0,2,1", "X1"]["a"] = 3
+    tripled = chain_engine.compile(["X0"], "X3")
+    assert tripled is not doubling and tripled.execute({"X0": 1}) == 24.0
+    data = dict(chain.G.edges["X2,2,1", "X3"])
+    chain.G.remove_edge("X2,2,1", "X3")
+    chain.G.add_edge("X2,2,1", "Y3", **{**data, "triad": ("Y3", "X2", "2", "1")})
+    try:
+        chain_engine.compile(["X0"], "X3")
+        assert False, "X3 lost its only rule"
+    except ValueError:
+        pass
+    # An assigned plain DiGraph is wrapped, so its later edits are seen too
+    chain.G = doubling_chain(3).G.to_directed(as_view=False)
+    assert chain_engine.compile(["X0"], "X3").execute({"X0": 1}) == 8.0
+    chain.G.edges["X2,2,1", "X3"]["b"] = 2
+    assert chain_engine.compile(["X0"], "X3").execute({"X0": 1}) == 4.0
+    print("✅ Plans replay solve() results and follow graph changes.")
+
+def test_solve_batch_matches_rows():
+    print("\n--- TEST: Columnar solve_batch vs per-row solve ---")
+
+    net = doubling_chain(3, reverse=True)
+    net.add_candidate_quartet((50, 1, 5, 10), ('2KE', '1', 'm', 'v2'))
+    net.add_candidate_quartet((25, 50, 1, 2), ('KE', '2KE', '1', '2'))
+    engine = GenericInferenceEngine(net)
+
+    rng = np.random.default_rng(0)
+    n = 200
+    columns = {var: rng.choice([0.0, 1.5, 4.0, -2.0, np.nan], size=n) for var in ("m", "v2", "PE", "KE", "E_total")}
+
+    for target in ("E_total", "v2", "m"):
+        batch = engine.solve_batch(columns, target)
+        for row in range(n):
+            inputs = {var: col[row] for var, col in columns.items() if not np.isnan(col[row])}
+            expected, _ = run_quiet(engine, inputs, target)
+            if expected is None:
+                assert np.isnan(batch[row]), (target, inputs)
+            else:
+                assert batch[row] == expected, (target, inputs, batch[row], expected)
+
+    chain = engine.solve_batch({"X0": np.arange(4.0)}, "X3", max_steps=2)
+    assert np.isnan(chain).all()
+    assert engine.solve_batch({"X0": np.arange(4.0)}, "X3").tolist() == [0.0, 8.0, 16.0, 24.0]
+    print("✅ Every row reaches the same value as its own solve() call.")
+
+def test_tracing_is_silent_by_default():
+    print("\n--- TEST: Tracers ---")
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        net = TriadicNetwork()
+        net.add_candidate_quartet((50, 1, 5, 10), ('2KE', '1', 'm', 'v2'))
+        net.add_candidate_quartet((25, 50, 1, 2), ('KE', '2KE', '1', '2'))
+        assert GenericInferenceEngine(net).solve({"m": 5, "v2": 10, "PE": 200}, "E_total") == 225.0
+    assert out.getvalue() == ""
+
+    log = MemoryTracer()
+    GenericInferenceEngine(net, tracer=log).solve({"m": 5, "v2": 10, "PE": 200}, "E_total")
+    assert [(f["fact"], f["kind"], f["step"]) for f in log.facts] == \
+        [("2KE", "multiplicative", 1), ("KE", "multiplicative", 1), ("E_total", "sum", 1)]
+    assert log.facts[-1]["premises"] == ("KE", "PE") and log.events[-1]["event"] == "success"
+    elapsed = [e["elapsed_ns"] for e in log.events]
+    assert elapsed == sorted(elapsed)
+
+    stream = io.StringIO()
+    GenericInferenceEngine(net, tracer=JsonLinesTracer(stream)).solve_backward({"m": 5, "v2": 10, "PE": 200}, "E_total")
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0]["event"] == "start" and records[-1] == {**records[-1], "event": "derived", "firings": 4}
+    assert records[1]["rule"] == ["2KE", "m", "v2", "1"]
+    print("✅ Silent by default, structured when asked.")
+
+def test_session_invalidates_only_dependents():
+    print("\n--- TEST: Incremental InferenceSession ---")
+
+    net = doubling_chain(3)
+    net.add_candidate_quartet((50, 1, 5, 10), ('2KE', '1', 'm', 'v2'))
+    net.add_candidate_quartet((25, 50, 1, 2), ('KE', '2KE', '1', '2'))
+    log = MemoryTracer()
+    engine = GenericInferenceEngine(net, tracer=log)
+
+    session = engine.session({"m": 5, "v2": 10, "PE": 200, "X0": 1})
+    assert session.get("E_total") == 225.0 and session.get("X3") == 8.0
+    assert [step.output for step in session.explain("E_total")] == ["2KE", "2", "KE", "E_total"]
+
+    # Changing m drops 2KE, KE and E_total but keeps the unrelated chain
+    log.clear()
+    session.set("m", 2)
+    assert set(log.events[0]["facts"]) == {"2KE", "KE", "E_total"}
+    assert "X3" in session.values and "2KE" not in session.values
+
+    log.clear()
+    assert session.get("E_total") == 210.0
+    assert [f["fact"] for f in log.facts] == ["2KE", "KE", "E_total"]
+
+    # Changing PE only re-adds the total
+    session.set("PE", 0)
+    log.clear()
+    assert session.get("E_total") == 10.0 and [f["fact"] for f in log.facts] == ["E_total"]
+
+    # Setting the same value is free, removing an input makes the target underivable
+    session.set("PE", 0.0)
+    assert "E_total" in session.values
+    session.remove("v2")
+    assert session.get("E_total") is None and session.get("X3") == 8.0
+
+    # A new rule resets derived facts
+    session.set("v2", 10)
+    net.add_candidate_quartet((2, 1, 2, 1), ('p', '1', 'q', '1'))
+    log.clear()
+    assert session.get("E_total") == 10.0 and len(log.facts) == 3
+    print("✅ Only the downstream facts of a changed input are recomputed.")
+
+def test_exact_mode():
+    print("\n--- TEST: Exact rational inference ---")
+
+    x = LazyRational.from_value(0.1)
+    assert x.to_fraction() == Fraction(1, 10)
+    assert (x + x + x) == Fraction(3, 10) and float(x * 3) == 0.3
+    assert str(LazyRational(6, -4)) == "-3/2" and int(LazyRational(-7, 2)) == -3
+    try:
+        x / 0
+        assert False, "division by zero must raise"
+    except ZeroDivisionError:
+        pass
+
+    # Thirds do not survive float arithmetic but are exact here
+    net = TriadicNetwork()
+    slices = []
+    for i in range(1, 31):
+        net.G.add_edge(f"v_{i},dt,1", f"d_{i}", triad=(f"d_{i}", f"v_{i}", "dt", "1"), a=1, b=1, K=1.0)
+        slices.append(f"d_{i}")
+    engine = GenericInferenceEngine(net)
+    engine.additive_laws.append(AdditiveLaw("Integral", slices, "D"))
+
+    inputs = {"dt": Fraction(1, 3), **{f"v_{i}": Fraction(i, 3) for i in range(1, 31)}}
+    exact = engine.solve(inputs, "D", exact=True)
+    assert isinstance(exact, LazyRational) and exact == Fraction(465, 9)
+    assert engine.solve(inputs, "D") != exact.to_fraction()
+    assert engine.solve_backward(inputs, "D", exact=True)[0] == exact
+
+    # NumPy scalars (e.g. values read from arrays) are accepted in exact mode
+    kinetic_net = TriadicNetwork()
+    kinetic_net.G.add_edge("m,v2,1", "2KE", triad=("2KE", "m", "v2", "1"), a=1, b=1, K=1.0)
+    kinetic = GenericInferenceEngine(kinetic_net)
+    for m in (np.float64(5), np.int64(5), np.float32(5)):
+        result = kinetic.solve({"m": m, "v2": np.int64(10)}, "2KE", exact=True)
+        assert isinstance(result, LazyRational) and result == 50
+    assert LazyRational.from_value(np.float64(0.1)).to_fraction() == Fraction(1, 10)
+    print("✅ Exact results with near-float bookkeeping.")
+
+if __name__ == "__main__":
+    test_worklist_keeps_sweep_order()
+    test_additive_law_wakes_up_triads()
+    test_backward_chaining_plan()
+    test_backward_chaining_long_chain()
+    test_compiled_plan_replay()
+    test_solve_batch_matches_rows()
+    test_tracing_is_silent_by_default()
+    test_session_invalidates_only_dependents()
+    test_exact_mode()
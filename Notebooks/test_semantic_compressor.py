@@ -0,0 +1,332 @@
+import sys
+import os
+import io
+import zlib
+import random
+import tempfile
+import contextlib
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pro1'))
+
+from semantic_compressor import (
+    SemanticCompressor, encode_varint, decode_varint, count_words, train_dictionary, save_dictionary, load_dictionary
+)
+from motor_semantico_v1.vector_space import VectorSpace
+
+def reference_tokens(compressor, text):
+    """The original per-position scan over vocab_list."""
+    tokens, literal, i, n = [], "", 0, len(text)
+    while i < n:
+        for word in compressor.vocab_list:
+            end = i + len(word)
+            if word and text.startswith(word, i) and (end == n or not text[end].isalpha()):
+                if literal:
+                    tokens.append(literal)
+                    literal = ""
+                tokens.append(compressor.word_to_id[word])
+                i = end
+                break
+        else:
+            literal += text[i]
+            i += 1
+    if literal:
+        tokens.append(literal)
+    return tokens
+
+def merged(tokens):
+    out = []
+    for t in tokens:
+        if isinstance(t, str) and out and isinstance(out[-1], str):
+            out[-1] += t
+        else:
+            out.append(t)
+    return out
+
+def make_compressor():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SemanticCompressor()
+
+def random_text(compressor, n_pieces=3000, seed=0):
+    rng = random.Random(seed)
+    pieces = compressor.vocab_list + ["re", "reyes", "niñ", "a", " ", ".", "\n", "ñ", "€", "1", "_", "Ⅻ"]
+    return "".join(rng.choice(pieces) for _ in range(n_pieces))
+
+def test_trie_tokenizer_matches_linear_scan():
+    print("\n--- TEST: Trie tokenizer vs per-word scan ---")
+
+    compressor = make_compressor()
+    # Overlapping entries: first in vocab order must still win
+    compressor.vocab_list += ["re", "reinado", "rey y"]
+    compressor.word_to_id = {w: i for i, w in enumerate(compressor.vocab_list)}
+    compressor.id_to_word = dict(enumerate(compressor.vocab_list))
+    compressor._build_matcher()
+
+    text = random_text(compressor)
+    expected = reference_tokens(compressor, text)
+    for chunk_size in (1, 7, 64, len(text)):
+        chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+        assert merged(compressor.tokenize(chunks)) == expected, chunk_size
+    print("✅ Same tokens for every chunking.")
+
+def test_streaming_compress_roundtrip():
+    print("\n--- TEST: Streaming compress ---")
+
+    compressor = make_compressor()
+    text = random_text(compressor, seed=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, semz, out = (os.path.join(tmp, name) for name in ("in.txt", "out.semz", "restored.txt"))
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(text)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressor.compress(src, semz, chunk_size=100)
+            compressor.decompress(semz, out)
+        with open(out, encoding="utf-8") as f:
+            assert f.read() == text
+
+        # A FIFO cannot be read twice: rejected up front, without opening it or writing output
+        if hasattr(os, "mkfifo"):
+            fifo, rejected = os.path.join(tmp, "in.fifo"), os.path.join(tmp, "rejected.semz")
+            os.mkfifo(fifo)
+            try:
+                compressor.compress(fifo, rejected)
+                assert False, "non-seekable input must be rejected"
+            except ValueError:
+                pass
+            assert not os.path.exists(rejected)
+    print("✅ Round trip through small chunks.")
+
+def roundtrip(compressor, text, **kw):
+    with tempfile.TemporaryDirectory() as tmp:
+        src, semz, out = (os.path.join(tmp, name) for name in ("in.txt", "out.semz", "restored.txt"))
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(text)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressor.compress(src, semz, **kw)
+            compressor.decompress(semz, out)
+        with open(out, encoding="utf-8") as f:
+            return f.read(), os.path.getsize(semz)
+
+def test_container_large_vocab_and_escaping():
+    print("\n--- TEST: .semz container with varint ids ---")
+
+    for value in list(range(20000)) + [2 ** 40]:
+        data = encode_varint(value)
+        assert decode_varint(data + b"rest") == (value, len(data))
+        assert 0xFF not in data, value  # never the marker
+    assert len(encode_varint(127)) == 1 and len(encode_varint(128)) == 2
+
+    compressor = make_compressor()
+    # 1000 words (letters only, so each is matched whole): far beyond what one id byte could address
+    letters = "abcdefghij"
+    compressor.vocab_list += ["palabra" + "".join(letters[int(d)] for d in f"{k:03d}") for k in range(1000)]
+    compressor.word_to_id = {w: i for i, w in enumerate(compressor.vocab_list)}
+    compressor.id_to_word = dict(enumerate(compressor.vocab_list))
+    compressor._build_matcher()
+
+    rng = random.Random(2)
+    words = compressor.vocab_list[-1000:]
+    text = " ".join(rng.choice(words) for _ in range(4000))
+    assert len(set(text.split())) > 900
+    text += " ÿ literal € palabrajjj "  # U+00FF is 0xC3 0xBF in UTF-8, not the marker
+    for codec in ("zlib", "bz2", "lzma"):
+        restored, _ = roundtrip(compressor, text, codec=codec, block_size=5000)
+        assert restored == text, codec
+
+    # Fixed overhead: 14-byte header, table and index varints, 4-byte index size
+    assert roundtrip(compressor, "") == ("", 14 + 2 + 1 + 4)
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_input.txt"), encoding="utf-8") as f:
+        sample = f.read()
+    restored, size = roundtrip(make_compressor(), sample)
+    assert restored == sample and size < 64
+
+    # 0xFF 0x00 is an escaped literal byte, 0xFF varint(rank + 1) a word
+    assert compressor.decode_payload(b"a\xff\x00b\xff\x02", [b"x", b"yz"]) == b"a\xffbyz"
+
+    # The most frequent word gets the one-byte id
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.txt")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write("rey " * 5 + "reina " * 9)
+        ranking = compressor.rank_words(src)
+    assert [compressor.vocab_list[i] for i in ranking] == ["reina", "rey"]
+
+    # A file written with one vocabulary is refused by another
+    with tempfile.TemporaryDirectory() as tmp:
+        src, semz = os.path.join(tmp, "in.txt"), os.path.join(tmp, "out.semz")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(text)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressor.compress(src, semz)
+            try:
+                make_compressor().decompress(semz, os.path.join(tmp, "x.txt"))
+                assert False, "vocabulary mismatch not detected"
+            except ValueError:
+                pass
+    print("✅ Varint ids, escaped 0xFF, frequency ranks and vocab check.")
+
+def test_legacy_file_still_decodes():
+    print("\n--- TEST: Legacy .semz ---")
+
+    compressor = make_compressor()
+    pro1 = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pro1")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "restored.txt")
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressor.decompress(os.path.join(pro1, "test_output.semz"), out)
+        with open(out, encoding="utf-8") as f, open(os.path.join(pro1, "test_input.txt"), encoding="utf-8") as g:
+            assert f.read() == g.read()
+    print("✅ Files without the container header use the original decoder.")
+
+def test_parallel_blocks_and_range_reads():
+    print("\n--- TEST: Parallel blocks and byte ranges ---")
+
+    compressor = make_compressor()
+    text = random_text(compressor, n_pieces=20000, seed=3)
+    data = text.encode("utf-8")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.txt")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(text)
+        outputs = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for workers in (1, 2):
+                semz = os.path.join(tmp, f"w{workers}.semz")
+                compressor.compress(src, semz, block_size=4096, workers=workers)
+                out = os.path.join(tmp, f"w{workers}.txt")
+                compressor.decompress(semz, out, workers=workers)
+                with open(semz, "rb") as f, open(out, encoding="utf-8") as g:
+                    outputs[workers] = f.read()
+                    assert g.read() == text
+
+            assert outputs[1] == outputs[2], "worker count must not change the file"
+            with open(semz, "rb") as f:
+                assert len(compressor.read_container(f)[2]) > 5
+
+            rng = random.Random(4)
+            spans = [(0, 10), (0, len(data)), (len(data) - 3, 50), (len(data) + 5, 10), (100, 0)]
+            spans += [(rng.randrange(len(data)), rng.randrange(20000)) for _ in range(20)]
+            for start, length in spans:
+                assert compressor.decompress_range(semz, start, length) == data[start:start + length], (start, length)
+            assert compressor.decompress_range(semz, 0, len(data), workers=2) == data
+    print("✅ Same file for any worker count; slices decoded from their blocks only.")
+
+def legacy_reference(compressor, stream):
+    """The original all-at-once decoder of the bare zlib format."""
+    out, i, n = [], 0, len(stream)
+    while i < n:
+        if stream[i] == compressor.marker_byte:
+            if i + 1 == n:
+                break
+            word = compressor.id_to_word.get(stream[i + 1])
+            out.append(chr(stream[i]) if word is None else word)
+            i += 1 if word is None else 2
+        else:
+            j = stream.find(compressor.marker_byte, i)
+            j = n if j == -1 else j
+            out.append(stream[i:j].decode("utf-8"))
+            i = j
+    return "".join(out)
+
+def test_streaming_decoders():
+    print("\n--- TEST: Streaming decompress ---")
+
+    compressor = make_compressor()
+    rng = random.Random(5)
+    pieces = [b"\xff", b"\xff\x03", b"\xff\x00", b"\xff\x63", "niño €Ⅻ ".encode("utf-8"), b"abc ", b"\n"]
+    stream = b"".join(rng.choice(pieces) for _ in range(3000)) + b"\xff"
+    expected = legacy_reference(compressor, stream)
+    text = random_text(compressor, n_pieces=5000, seed=6)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy, src, semz = (os.path.join(tmp, name) for name in ("legacy.semz", "in.txt", "out.semz"))
+        with open(legacy, "wb") as f:
+            f.write(zlib.compress(stream))
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(text)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compressor.compress(src, semz, block_size=50000)
+            for chunk_size in (1, 2, 5, 64, 1 << 16):
+                out = os.path.join(tmp, f"legacy{chunk_size}.txt")
+                compressor.decompress(legacy, out, chunk_size=chunk_size)
+                with open(out, encoding="utf-8", newline="") as f:
+                    assert f.read() == expected, chunk_size
+
+                out = os.path.join(tmp, f"semz{chunk_size}.txt")
+                compressor.decompress(semz, out, workers=1, chunk_size=chunk_size)
+                with open(out, encoding="utf-8") as f:
+                    assert f.read() == text, chunk_size
+    print("✅ Same output as the all-at-once decoders for any chunk size.")
+
+def test_dictionary_training_and_sources():
+    print("\n--- TEST: Trained dictionaries ---")
+
+    rng = random.Random(7)
+    vocab = ["constitución", "parlamento", "gobierno", "ley", "de", "artículo", "señoría"]
+    text = " ".join(rng.choices(vocab, weights=[5, 4, 4, 3, 20, 6, 1], k=5000)) + " único."
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dictionary = os.path.join(tmp, "sample.txt"), os.path.join(tmp, "dict.semd")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        counts = count_words(src)
+        assert count_words(src, chunk_size=3) == counts and counts["único"] == 1
+
+        # A long unspaced run across many chunks is scanned once, not once per chunk
+        cjk = os.path.join(tmp, "cjk.txt")
+        with open(cjk, "w", encoding="utf-8") as f:
+            f.write("漢字" * 500000 + " fin")
+        assert count_words(cjk, chunk_size=1024) == {"漢字" * 500000: 1, "fin": 1}
+        words = train_dictionary(src, seed_words=["Madrid", "de", "x", "ministerio", "dos palabras"])
+        # "de" cannot pay for its 2-byte code; "único" is seen once; seeds fill the rest
+        assert set(words[:4]) == {"constitución", "parlamento", "gobierno", "artículo"}
+        assert words[4:] == ["señoría", "ley", "Madrid", "ministerio"]
+        assert train_dictionary(src, max_words=2) == words[:2]
+
+        digest = save_dictionary(words, dictionary)
+        assert load_dictionary(dictionary) == words
+        with contextlib.redirect_stdout(io.StringIO()):
+            trained = SemanticCompressor(dictionary)
+        assert trained.vocab_hash.hex() == digest and trained.vs is None
+        restored, size = roundtrip(trained, text)
+        assert restored == text and size < roundtrip(make_compressor(), text)[1]
+        assert size < len(zlib.compress(text.encode("utf-8")))
+
+        # Short words built from a few syllables: zlib already codes them well, so the raw
+        # byte-saving list makes the output bigger and training cuts it down
+        syllables = ["ca", "sa", "ra", "ma", "la", "ne", "te", "re", "de", "ci", "si", "ión"]
+        zipf = sorted({"".join(rng.choices(syllables, k=rng.randint(1, 4))) for _ in range(3000)}, key=lambda w: (len(w), w))
+        zipf_text = " ".join(rng.choices(zipf, weights=[1 / r for r in range(1, len(zipf) + 1)], k=30000))
+        zipf_src = os.path.join(tmp, "zipf.txt")
+        with open(zipf_src, "w", encoding="utf-8") as f:
+            f.write(zipf_text)
+        raw, pruned = train_dictionary(zipf_src, codec=None), train_dictionary(zipf_src)
+        assert pruned == raw[:len(pruned)] and len(pruned) < len(raw)
+        pruned_size = roundtrip(SemanticCompressor(pruned), zipf_text)[1]
+        assert pruned_size < roundtrip(SemanticCompressor(raw), zipf_text)[1]
+        assert pruned_size <= roundtrip(SemanticCompressor([]), zipf_text)[1]
+
+        with open(dictionary, "a", encoding="utf-8") as f:
+            f.write("extra\n")
+        try:
+            load_dictionary(dictionary)
+            assert False, "edited dictionary accepted"
+        except ValueError:
+            pass
+
+    # Any VectorSpace (e.g. GloVe) or word list can serve as vocabulary
+    vs = VectorSpace()
+    vs.add_words(["ley", "gobierno"], [[1.0, 0.0], [0.0, 1.0]])
+    assert SemanticCompressor(vs).vocab_list == ["ley", "gobierno"]
+    assert SemanticCompressor(["a", "b"]).vocab_list == ["a", "b"]
+    print("✅ Byte-saving words first, then seeds, cut to what zlib rewards; saved with its hash.")
+
+if __name__ == "__main__":
+    test_trie_tokenizer_matches_linear_scan()
+    test_streaming_compress_roundtrip()
+    test_container_large_vocab_and_escaping()
+    test_legacy_file_still_decodes()
+    test_parallel_blocks_and_range_reads()
+    test_streaming_decoders()
+    test_dictionary_training_and_sources()
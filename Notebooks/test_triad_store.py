@@ -0,0 +1,74 @@
+import sys
+import os
+import random
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triadic_framework.core.network import TriadicNetwork
+from triadic_framework.core.generic_inference import GenericInferenceEngine
+
+QUARTETS = [
+    ((50, 1, 5, 10), ('2KE', '1', 'm', 'v2')),
+    ((25, 50, 1, 2), ('KE', '2KE', '1', '2')),
+    ((6, 2, 3, 1), ('F', 'm', 'a', '1')),
+    ((50, 1, 5, 10), ('2KE', '1', 'm', 'v2')),  # duplicate: overwrites, as add_edge did
+]
+
+def test_columnar_store_and_lazy_view():
+    print("\n--- TEST: Columnar TriadStore ---")
+
+    net = TriadicNetwork()
+    for values, labels in QUARTETS:
+        net.add_candidate_quartet(values, labels)
+
+    assert len(net.triads) == 3 and net.triads.C.shape == (3, 4)
+    assert net._G is None, "nothing should build the networkx view yet"
+
+    # The engine runs straight from the store
+    engine = GenericInferenceEngine(net)
+    assert engine.solve({"m": 5, "v2": 10, "PE": 200}, "E_total") == 225.0
+    assert net._G is None
+    from_store = list(net.iter_triads())
+
+    # The lazy view has the same edges, attributes and order
+    G = net.G
+    assert G.number_of_edges() == 3
+    assert G.edges["2KE,m,v2", "1"]["label"] == "2KE·1=1/1·m·v2"
+    assert list(net.iter_triads()) == from_store
+
+    # Direct edits survive and later triads are synced in
+    G.add_node("BRANCH_Mechanics", type="branch")
+    net.add_candidate_quartet((12, 3, 4, 1), ('p', 'm', 'v', '1'))
+    assert net.G is G and "BRANCH_Mechanics" in G and G.number_of_edges() == 4
+    assert engine.solve({"m": 3, "v": 4}, "p") == 12.0
+    print("✅ Triads stored as arrays; graph view built on demand.")
+
+def test_bulk_ingestion_matches_sequential():
+    print("\n--- TEST: add_candidate_quartets vs add_candidate_quartet ---")
+
+    rng = random.Random(0)
+    names = ["F", "m", "a", "v", "t", "E", "P", "x", "1"]
+    candidates = []
+    for _ in range(600):
+        values = tuple(rng.choice([0, 1, 2, 3, 4, 6, 8, 12, 2 ** 70]) for _ in range(4))
+        candidates.append((values, tuple(rng.sample(names, 4))))
+    # A dimensionally inconsistent candidate (KE · 1 = m · 2KE): K = 1 but rejected
+    candidates.append(((6, 1, 2, 3), ("KE", "1", "m", "2KE")))
+
+    sequential = TriadicNetwork()
+    for values, labels in candidates:
+        sequential.add_candidate_quartet(values, labels)
+
+    for workers in (1, 2):
+        bulk = TriadicNetwork()
+        counts = bulk.add_candidate_quartets(candidates, workers=workers, chunk_size=64)
+        assert list(bulk.iter_triads()) == list(sequential.iter_triads())
+        assert sum(counts.values()) == len(candidates)
+        assert counts["accepted"] >= len(bulk.triads) and counts["dimension"] >= 1
+        print(f"workers={workers}: {counts}")
+    print("✅ Same graph, with per-reason rejection counts.")
+
+if __name__ == "__main__":
+    test_columnar_store_and_lazy_view()
+    test_bulk_ingestion_matches_sequential()
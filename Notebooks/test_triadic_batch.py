@@ -0,0 +1,104 @@
+import sys
+import os
+import random
+from fractions import Fraction
+from itertools import permutations
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triadic_framework.core.triadic_engine import Triadic
+from triadic_framework.core.triadic_search import auto_discover_best_triplet, auto_discover_best_triplets
+
+def brute_force_triplet(values, labels):
+    """Reference: the original scan over all 24 permutations."""
+    best_k, best = Fraction(0), None
+    for perm_values, perm_labels in zip(permutations(values), permutations(labels)):
+        try:
+            result = Triadic.discovery(*perm_values)
+        except ValueError:
+            continue
+        if result.simplicity > best_k:
+            best_k = result.simplicity
+            best = (float(best_k), f"{result.a}/{result.b}", perm_labels)
+    return best
+
+def test_discovery_batch_matches_scalar():
+    print("\n--- TEST: discovery_batch vs discovery (row by row) ---")
+
+    rng = random.Random(42)
+    rows = [tuple(rng.randint(0, 60) for _ in range(4)) for _ in range(500)]
+    # Rows that overflow int64 and must take the Python int fallback
+    rows += [(2**40 + 1, 3, 5, 2**40 + 7), (2**62, 1, 1, 2**62 - 1)]
+
+    cols = [np.array(c, dtype=np.int64) for c in zip(*rows)]
+    batch = Triadic.discovery_batch(*cols)
+
+    mismatches = 0
+    for i, row in enumerate(rows):
+        try:
+            res = Triadic.discovery(*row)
+        except ValueError:
+            if batch.valid[i]:
+                mismatches += 1
+            continue
+        if not (batch.valid[i] and batch.a[i] == res.a and batch.b[i] == res.b
+                and batch.simplicity[i] == float(res.simplicity)):
+            mismatches += 1
+
+    print(f"Rows: {len(rows)} | Mismatches: {mismatches}")
+    assert mismatches == 0
+    print("✅ Batch discovery agrees with the scalar engine.")
+
+def test_discovery_batch_rejects_negative():
+    try:
+        Triadic.discovery_batch(np.array([-1]), np.array([1]), np.array([1]), np.array([1]))
+    except ValueError:
+        print("✅ Negative inputs rejected.")
+        return
+    assert False, "Negative inputs should raise ValueError"
+
+def test_pruned_search_matches_permutations():
+    print("\n--- TEST: 3-pairing search vs 24-permutation scan ---")
+
+    rng = random.Random(7)
+    pool = [0, 1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 30]
+    quartets = [tuple(rng.choice(pool) for _ in range(4)) for _ in range(1000)]
+    labels = ("F", "m", "a", "1")
+
+    bulk = auto_discover_best_triplets(quartets, [labels] * len(quartets))
+    for values, bulk_res in zip(quartets, bulk):
+        res = auto_discover_best_triplet(values, labels)
+        assert res == bulk_res
+        expected = brute_force_triplet(values, labels)
+        if expected is None:
+            assert res is None
+        else:
+            assert (res["K"], res["a/b"], (res["C1"], res["C2"], res["C3"], res["C4"])) == expected
+
+    print(f"✅ {len(quartets)} quartets: same K, same a/b, same label order.")
+
+def test_bulk_search_large_values():
+    print("\n--- TEST: Bulk search with a·b beyond float precision ---")
+
+    rng = random.Random(11)
+    quartets = []
+    for _ in range(500):
+        # Shared factors make several pairings reduce, with a·b well past 2^53
+        p, q, r = (rng.randrange(1 << 20, 1 << 31) for _ in range(3))
+        values = [p * q, q * r, p * r, rng.randrange(1, 1 << 31) * rng.choice([p, q, r, 1])]
+        rng.shuffle(values)
+        quartets.append(tuple(values))
+    labels = ("A", "B", "C", "D")
+
+    bulk = auto_discover_best_triplets(np.array(quartets, dtype=np.int64), [labels] * len(quartets))
+    assert bulk == [auto_discover_best_triplet(v, labels) for v in quartets]
+    print(f"✅ {len(quartets)} quartets: bulk picks the scalar pairing (exact a·b ranking).")
+
+if __name__ == "__main__":
+    test_discovery_batch_matches_scalar()
+    test_discovery_batch_rejects_negative()
+    test_pruned_search_matches_permutations()
+    test_bulk_search_large_values()
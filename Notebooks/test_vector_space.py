@@ -0,0 +1,177 @@
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from motor_semantico_v1 import vector_space, semantic_engine
+from motor_semantico_v1.buss_framework.core import vector_space as buss_vector_space
+from motor_semantico_v1.buss_framework.core import semantic_engine as buss_semantic_engine
+from motor_semantico_v1.ann_index import IVFIndex
+from motor_semantico_v1.semantic_engine import cosine_distance
+
+# buss_framework/core keeps its own copy of both modules: every test runs on each copy
+COPIES = [(m.VectorSpace, e.SemanticResonanceEngine, m.convert_text_to_binary)
+          for m, e in ((vector_space, semantic_engine), (buss_vector_space, buss_semantic_engine))]
+
+def random_space(VectorSpace, n_words=2000, dims=50, seed=0):
+    rng = np.random.default_rng(seed)
+    vs = VectorSpace()
+    for i in range(n_words):
+        vs.add_word(f"w{i}", rng.standard_normal(dims))
+    return vs
+
+def test_matrix_backed_storage():
+    print("\n--- TEST: Matrix-backed VectorSpace ---")
+
+    for VectorSpace, SemanticResonanceEngine, convert_text_to_binary in COPIES:
+        vs = VectorSpace(capacity=2)
+        vs.load_synthetic_data()
+
+        # Storage: one contiguous float32 matrix, grown amortized
+        assert vs.matrix.shape == (9, 3) and vs.matrix.dtype == np.float32
+        assert vs.matrix.base is vs._matrix or vs.matrix.base is vs._matrix.base
+        assert np.allclose(vs.norms, np.linalg.norm(vs.matrix, axis=1))
+
+        # Compatibility with the old dict-based API
+        assert list(vs.vocab)[:2] == ["hombre", "mujer"]
+        assert "reina" in vs.vocab and len(vs.vocab) == 9
+        assert np.array_equal(vs.get_vector("rey"), [-1.0, 1.0, 1.0])
+        assert vs.get_vector("unicornio") is None
+
+        # Re-adding a word overwrites its row (and its norm)
+        vs.add_word("manzana", [3.0, 4.0, 0.0])
+        assert len(vs) == 9 and vs.norms[vs.word_to_index["manzana"]] == 5.0
+        print("✅ Matrix storage keeps the vocab/get_vector contract.")
+
+def test_vectorized_analogy_matches_loop():
+    print("\n--- TEST: Vectorized solve_analogy vs per-word loop ---")
+
+    for VectorSpace, SemanticResonanceEngine, convert_text_to_binary in COPIES:
+        vs = random_space(VectorSpace)
+        engine = SemanticResonanceEngine(vs)
+
+        for A, B, C in [("w1", "w2", "w3"), ("w10", "w200", "w1500"), ("w7", "w8", "w7")]:
+            target = vs.get_vector(C) + (vs.get_vector(B) - vs.get_vector(A))
+            expected = min((w for w in vs.vocab if w not in [A, B, C]),
+                           key=lambda w: cosine_distance(target, vs.vocab[w]))
+
+            ranked = engine.solve_analogy_topk(A, B, C, k=5)
+            assert engine.solve_analogy(A, B, C) == expected == ranked[0][0]
+            assert all(w not in [A, B, C] for w, _ in ranked)
+            assert [s for _, s in ranked] == sorted([s for _, s in ranked], reverse=True)
+
+        assert engine.solve_analogy("w1", "desconocida", "w2") is None
+        print("✅ Same answers as the brute-force loop, ranked with scores.")
+
+def test_batched_analogies_match_single():
+    print("\n--- TEST: solve_analogies_batch vs solve_analogy_topk ---")
+
+    for VectorSpace, SemanticResonanceEngine, convert_text_to_binary in COPIES:
+        vs = random_space(VectorSpace, n_words=3000)
+        engine = SemanticResonanceEngine(vs)
+
+        rng = np.random.default_rng(1)
+        A, B, C = ([f"w{i}" for i in col] for col in rng.integers(0, 3000, (3, 300)))
+        A[0] = "desconocida"
+
+        # A tiny budget forces many blocks
+        batch = engine.solve_analogies_batch(A, B, C, k=3, memory_budget_mb=0.1)
+        single = [engine.solve_analogy_topk(a, b, c, k=3) for a, b, c in zip(A, B, C)]
+
+        assert batch[0] == [] == single[0]
+        agree = sum([w for w, _ in x] == [w for w, _ in y] for x, y in zip(batch, single))
+        print(f"Agreement: {agree}/{len(single)}")
+        assert agree == len(single)
+        print("✅ Blocked matrix-matrix scoring reproduces the single-query ranking.")
+
+def test_binary_format_roundtrip():
+    print("\n--- TEST: GloVe text -> .vsb -> memmap ---")
+
+    for VectorSpace, SemanticResonanceEngine, convert_text_to_binary in COPIES:
+        vs = random_space(VectorSpace, n_words=500, dims=20)
+        with tempfile.TemporaryDirectory() as tmp:
+            txt = os.path.join(tmp, "mini_glove.txt")
+            vsb = os.path.join(tmp, "mini_glove.vsb")
+            with open(txt, "w", encoding="utf-8") as f:
+                for word in vs.vocab:
+                    f.write(word + " " + " ".join(repr(float(x)) for x in vs.vocab[word]) + "\n")
+
+            from_text = VectorSpace()
+            assert from_text.load_text(txt, chunk_lines=64) == 500
+            assert convert_text_to_binary(txt, vsb, chunk_lines=64) == 500
+
+            mapped = VectorSpace.open_binary(vsb)
+            assert isinstance(mapped._matrix, np.memmap)
+            for other in (from_text, mapped):
+                assert other.index_to_word == vs.index_to_word
+                assert np.array_equal(other.matrix, vs.matrix)
+                assert np.allclose(other.norms, vs.norms)
+
+            # Writing to a mapped space copies it to memory; the file is untouched
+            mapped.add_word("w0", np.zeros(20))
+            mapped.add_word("nueva", np.ones(20))
+            assert not isinstance(mapped._matrix, np.memmap) and len(mapped) == 501
+            assert np.array_equal(VectorSpace.open_binary(vsb).get_vector("w0"), vs.get_vector("w0"))
+            del mapped, from_text
+        print("✅ Text and binary loaders reproduce the same space.")
+
+def test_ivf_index_incremental_and_persistent():
+    print("\n--- TEST: IVF approximate index ---")
+
+    for VectorSpace, SemanticResonanceEngine, convert_text_to_binary in COPIES:
+        vs = random_space(VectorSpace, n_words=3000, dims=16)
+        index = IVFIndex(vs, n_lists=32, n_probe=4).train(iterations=5)
+        assert vs.index is index
+        # More lists than sampled vectors: clamped to the sample
+        assert IVFIndex(random_space(VectorSpace, n_words=50, dims=4), n_lists=64).train(sample_size=20).n_lists == 20
+        query = vs.get_vector("w42")
+
+        # Probing every list is exact search
+        exact_rows, _ = vs.nearest(query, k=5, exclude=[42])
+        full_rows, _ = vs.index.search(query, k=5, exclude=[42], n_probe=32)
+        assert full_rows.tolist() == exact_rows.tolist()
+
+        # New words are indexed as they are added
+        vs.add_word("gemela", query * 2)
+        rows, _ = vs.nearest(query, k=1, exclude=[42], approximate=True)
+        assert vs.index_to_word[rows[0]] == "gemela"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ivf.idx")  # saved under the exact name given
+            vs.index.save(path)
+            vs.add_word("tardia", -query)  # added after saving: assigned on load
+            loaded = IVFIndex.load(path, vs)
+            assert vs.index is loaded
+            assert loaded.search(-query, k=1)[0].tolist() == [vs.word_to_index["tardia"]]
+            # The reloaded index keeps tracking add_word
+            vs.add_word("nueva", query * 3)
+            twins = [42, vs.word_to_index["gemela"]]
+            assert loaded.search(query, k=1, exclude=twins)[0].tolist() == [vs.word_to_index["nueva"]]
+        print("✅ Index tracks add_word and survives a save/load cycle.")
+
+def test_resonance_matrix_matches_pairwise():
+    print("\n--- TEST: resonance_matrix vs calculate_resonance ---")
+
+    for VectorSpace, SemanticResonanceEngine, convert_text_to_binary in COPIES:
+        vs = random_space(VectorSpace, n_words=200, dims=10)
+        engine = SemanticResonanceEngine(vs)
+        pairs = [(f"w{i}", f"w{i + 100}") for i in range(40)] + [("w3", "w3")]
+
+        R = engine.resonance_matrix(pairs, chunk_size=7)
+        expected = np.array([[engine.calculate_resonance(a, b, c, d) for c, d in pairs] for a, b in pairs])
+
+        assert R.shape == (41, 41)
+        assert np.allclose(R, expected, atol=1e-5)
+        print("✅ Gram-matrix resonance equals the per-pair computation.")
+
+if __name__ == "__main__":
+    test_matrix_backed_storage()
+    test_vectorized_analogy_matches_loop()
+    test_batched_analogies_match_single()
+    test_binary_format_roundtrip()
+    test_ivf_index_incremental_and_persistent()
+    test_resonance_matrix_matches_pairwise()
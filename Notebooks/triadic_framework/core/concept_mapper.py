@@ -1,4 +1,6 @@
-import math
+from collections import OrderedDict
+
+FACTORIZATION_CACHE_SIZE = 65536
 
 class PrimeConceptMapper:
     """
@@ -55,40 +57,146 @@ class PrimeConceptMapper:
             "victim": ["HUMAN", "NEGATIVE", "WEAK"] # Negative situation
         }
 
-    def get_concept_value(self, word: str) -> int:
+        self._build_basis()
+
+    # --- Sparse exponent-vector representation ---
+    # A concept is stored as {attribute index: exponent}, e.g. "man" -> {1: 1, 4: 1, 12: 1}
+    # (HUMAN·MALE·ADULT). Integers are only materialised when asked for; vector -> value
+    # results are cached, value -> factorization results in a bounded LRU cache.
+
+    def _build_basis(self):
+        self.attribute_names = list(self.attribute_map)
+        self.primes = [self.attribute_map[attr] for attr in self.attribute_names]
+        self.attribute_index = {attr: i for i, attr in enumerate(self.attribute_names)}
+        self._concept_vectors = {}   # word -> exponent vector
+        self._vector_values = {}     # frozen exponent vector -> int value
+        # int value -> (exponent vector, unknown remainder); LRU, bounded for long ingests
+        self._factorizations = OrderedDict()
+        self._name_index = None      # int value -> word, built on first reverse lookup
+
+    def get_concept_vector(self, word: str) -> dict:
         """
-        Returns the integer representation of a word by multiplying its attribute primes.
+        Returns the sparse exponent vector {attribute index: exponent} of a word.
         """
         word = word.lower()
-        if word not in self.concept_definitions:
-            raise ValueError(f"Concept '{word}' not defined in mapper.")
-            
-        attributes = self.concept_definitions[word]
-        value = 1
+        vec = self._concept_vectors.get(word)
+        if vec is None:
+            if word not in self.concept_definitions:
+                raise ValueError(f"Concept '{word}' not defined in mapper.")
+            vec = self.vector_from_attributes(self.concept_definitions[word])
+            self._concept_vectors[word] = vec
+        return dict(vec)
+
+    def vector_from_attributes(self, attributes: list) -> dict:
+        vec = {}
         for attr in attributes:
-            if attr in self.attribute_map:
-                value *= self.attribute_map[attr]
-            else:
+            idx = self.attribute_index.get(attr)
+            if idx is None:
                 raise ValueError(f"Attribute '{attr}' not found in basis.")
-        
+            vec[idx] = vec.get(idx, 0) + 1
+        return vec
+
+    def value_from_vector(self, vec: dict) -> int:
+        """
+        Materialises the integer of an exponent vector (cached).
+        """
+        key = tuple(sorted(vec.items()))
+        value = self._vector_values.get(key)
+        if value is None:
+            if any(exp < 0 for _, exp in key):
+                raise ValueError(f"Exponent vector {dict(key)} does not describe an integer concept.")
+            value = 1
+            for idx, exp in key:
+                value *= self.primes[idx] ** exp
+            self._vector_values[key] = value
+            # The exponents are the value's factorization: a round trip skips trial division
+            self._remember_factorization(value, ({idx: exp for idx, exp in key if exp}, 1))
         return value
 
-    def get_attributes_from_value(self, value: int) -> list:
+    def factorize(self, value: int) -> tuple:
         """
-        Reverse engineering: Factorize the integer to find its attributes.
+        Returns (exponent vector, remainder). The remainder is the part of the value
+        not covered by the basis (1 if fully factorized). Results are cached.
         """
-        attributes = []
+        if value == 0:
+            raise ValueError("Cannot factorize 0.")
+        entry = self._factorizations.get(value)
+        if entry is None:
+            entry = self._trial_divide(value)
+            self._remember_factorization(value, entry)
+        else:
+            self._factorizations.move_to_end(value)
+        vec, remainder = entry
+        return dict(vec), remainder
+
+    def _remember_factorization(self, value: int, entry: tuple):
+        self._factorizations[value] = entry
+        self._factorizations.move_to_end(value)
+        if len(self._factorizations) > FACTORIZATION_CACHE_SIZE:
+            self._factorizations.popitem(last=False)
+
+    def _trial_divide(self, value: int) -> tuple:
+        vec = {}
         temp_val = value
-        
-        # Check each prime in our basis
-        for attr, prime in self.attribute_map.items():
+        for idx, prime in enumerate(self.primes):
+            if temp_val == 1:
+                break
             while temp_val % prime == 0:
-                attributes.append(attr)
+                vec[idx] = vec.get(idx, 0) + 1
                 temp_val //= prime
+        return vec, temp_val
+
+    @staticmethod
+    def multiply_vectors(v1: dict, v2: dict) -> dict:
+        """Product of two concepts: exponents add."""
+        out = dict(v1)
+        for idx, exp in v2.items():
+            e = out.get(idx, 0) + exp
+            if e:
+                out[idx] = e
+            else:
+                out.pop(idx, None)
+        return out
+
+    @staticmethod
+    def divide_vectors(v1: dict, v2: dict) -> dict:
+        """Quotient of two concepts: exponents subtract (may go negative)."""
+        return PrimeConceptMapper.multiply_vectors(v1, {idx: -exp for idx, exp in v2.items()})
+
+    def add_concept(self, word: str, attributes: list):
+        """
+        Defines (or redefines) a concept and refreshes its cached vector.
+        """
+        word = word.lower()
+        vec = self.vector_from_attributes(attributes)
+        redefined = word in self.concept_definitions
+        self.concept_definitions[word] = list(attributes)
+        self._concept_vectors[word] = vec
+
+        if self._name_index is not None:
+            if redefined:
+                self._name_index = None  # rebuilt lazily, keeps first-defined-wins order
+            else:
+                self._name_index.setdefault(self.value_from_vector(vec), word)
+
+    def get_concept_value(self, word: str) -> int:
+        """
+        Returns the integer representation of a word by multiplying its attribute primes.
+        """
+        return self.value_from_vector(self.get_concept_vector(word))
+
+    def get_attributes_from_value(self, value: int) -> list:
+        """
+        Reverse engineering: Factorize the integer to find its attributes.
+        """
+        vec, remainder = self.factorize(value)
+        attributes = []
+        for idx in sorted(vec):
+            attributes.extend([self.attribute_names[idx]] * vec[idx])
                 
-        if temp_val != 1:
+        if remainder != 1:
             # If we have a remainder, it means the number has factors not in our basis
-            attributes.append(f"UNKNOWN_FACTOR({temp_val})")
+            attributes.append(f"UNKNOWN_FACTOR({remainder})")
             
         return attributes
 
@@ -96,11 +204,26 @@ class PrimeConceptMapper:
         """
         Find the word that matches this integer value.
         """
-        # 1. Check exact matches
-        for word in self.concept_definitions:
-            if self.get_concept_value(word) == value:
-                return word
+        # 1. Check exact matches (O(1) through the value -> word index)
+        if self._name_index is None:
+            self._build_name_index()
+        word = self._name_index.get(value)
+        if word is not None:
+            return word
                 
         # 2. If no exact match, return the factorized description
         attrs = self.get_attributes_from_value(value)
         return f"Composite({', '.join(attrs)})"
+
+    def get_concept_names(self, values) -> list:
+        """
+        Batch variant of get_concept_name.
+        """
+        return [self.get_concept_name(value) for value in values]
+
+    def _build_name_index(self):
+        # When several words share a value, the first defined one wins (as in a linear scan)
+        index = {}
+        for word in self.concept_definitions:
+            index.setdefault(self.get_concept_value(word), word)
+        self._name_index = index
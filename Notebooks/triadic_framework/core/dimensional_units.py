@@ -1,20 +1,96 @@
+"""
+dimensional_units.py v2.0.0 – 2026-10-17
+UPDATE: Packed, interned units. The 5 exponents (M, L, T, I, 1) are stored as biased 12-bit
+fields of one integer `code`; each distinct unit exists once, so units are hashable and
+comparable by code, and * and / are one integer addition. Exponents are limited to
+[-512, 511], which keeps the sum of two codes carry-free: u1·u4 == u2·u3 becomes
+code1 + code4 == code2 + code3, also over whole arrays (balance_mask).
+"""
+
 from typing import Tuple, Dict
+import numpy as np
+
 UnitTuple = Tuple[int, int, int, int, int]
 
+_BITS = 12
+_FIELD = (1 << _BITS) - 1
+_BIAS = 1 << 10                  # field value of exponent 0
+_MAX_EXP = 511
+_N_DIMS = 5
+_BIAS_ALL = sum(_BIAS << (_BITS * i) for i in range(_N_DIMS))
+
+UNKNOWN_UNIT = -1                # unit code meaning "no unit known" (always balanced)
+
+def pack(exponents: UnitTuple) -> int:
+    if len(exponents) != _N_DIMS:
+        raise ValueError(f"A unit has {_N_DIMS} exponents, got {len(exponents)}")
+    code = 0
+    for i, e in enumerate(exponents):
+        if e != int(e):
+            raise ValueError(f"Unit exponents must be integers, got {e}")
+        if not -_MAX_EXP - 1 <= e <= _MAX_EXP:
+            raise OverflowError(f"Unit exponent {e} outside [{-_MAX_EXP - 1}, {_MAX_EXP}]")
+        code |= (int(e) + _BIAS) << (_BITS * i)
+    return code
+
+def unpack(code: int) -> UnitTuple:
+    return tuple(((code >> (_BITS * i)) & _FIELD) - _BIAS for i in range(_N_DIMS))
+
 class DimensionalUnit:
-    def __init__(self, exponents: UnitTuple = (0, 0, 0, 0, 0)):
-        self.exponents = exponents
+    __slots__ = ("code", "_exponents")
+    _interned: Dict[int, 'DimensionalUnit'] = {}
+
+    def __new__(cls, exponents: UnitTuple = (0, 0, 0, 0, 0)):
+        return cls._from_code(pack(tuple(exponents)))
+
+    @classmethod
+    def _from_code(cls, code: int) -> 'DimensionalUnit':
+        unit = cls._interned.get(code)
+        if unit is None:
+            exponents = unpack(code)
+            # Out-of-range results of * and / decode to out-of-range fields: re-check once
+            pack(exponents)
+            unit = object.__new__(cls)
+            unit.code = code
+            unit._exponents = exponents
+            cls._interned[code] = unit
+        return unit
+
+    @property
+    def exponents(self) -> UnitTuple:
+        return self._exponents
     def __mul__(self, other: 'DimensionalUnit') -> 'DimensionalUnit':
-        return DimensionalUnit(tuple(a + b for a, b in zip(self.exponents, other.exponents)))
+        return DimensionalUnit._from_code(self.code + other.code - _BIAS_ALL)
     def __truediv__(self, other: 'DimensionalUnit') -> 'DimensionalUnit':
-        return DimensionalUnit(tuple(a - b for a, b in zip(self.exponents, other.exponents)))
+        return DimensionalUnit._from_code(self.code - other.code + _BIAS_ALL)
     def __pow__(self, power: int) -> 'DimensionalUnit':
-        return DimensionalUnit(tuple(exp * power for exp in self.exponents))
+        return DimensionalUnit(tuple(exp * power for exp in self._exponents))
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, DimensionalUnit): return False
-        return self.exponents == other.exponents
+        return self.code == other.code
+    def __hash__(self) -> int:
+        return hash(self.code)
+    def __reduce__(self):
+        # Unpickled units (e.g. in worker processes) go through the intern table
+        return (DimensionalUnit, (self._exponents,))
     def __repr__(self) -> str:
-        return str(self.exponents)
+        return str(self._exponents)
+
+def unit_codes(labels, units_map: Dict[str, DimensionalUnit]) -> np.ndarray:
+    """int64 codes for a sequence (or nested sequences) of labels; UNKNOWN_UNIT where unmapped."""
+    codes = {lbl: unit.code for lbl, unit in units_map.items() if isinstance(unit, DimensionalUnit)}
+    flat = np.asarray(labels, dtype=object)
+    out = np.fromiter((codes.get(lbl, UNKNOWN_UNIT) for lbl in flat.ravel()), dtype=np.int64, count=flat.size)
+    return out.reshape(flat.shape)
+
+def balance_mask(u1: np.ndarray, u2: np.ndarray, u3: np.ndarray, u4: np.ndarray) -> np.ndarray:
+    """
+    Row-wise u1·u4 == u2·u3 over arrays of unit codes. Rows with an unknown unit are
+    accepted, as check_dimensional_balance does.
+    """
+    u1, u2, u3, u4 = (np.asarray(u, dtype=np.int64) for u in (u1, u2, u3, u4))
+    unknown = (u1 < 0) | (u2 < 0) | (u3 < 0) | (u4 < 0)
+    return unknown | (u1 + u4 == u2 + u3)
 
 M = DimensionalUnit((1, 0, 0, 0, 0))
 L = DimensionalUnit((0, 1, 0, 0, 0))
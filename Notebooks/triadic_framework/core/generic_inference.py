@@ -1,109 +1,719 @@
 """
-generic_inference.py v1.1.0 – 2025-11-19
-UPDATE: Refactoring of additive logic (Explicit Sum/Subtraction) and step counter correction.
+generic_inference.py v2.6.0 – 2026-10-17
+UPDATE: Exact mode. solve(..., exact=True) and solve_backward(..., exact=True) carry values as
+LazyRational (rational.py) instead of float, so no integer scaling is needed for exactness.
+v2.5.0: InferenceSession. Keeps derived facts with their provenance between queries; changing
+an input invalidates only its downstream dependents, which are re-derived on demand.
+v2.4.0: Messages go through a pluggable tracer (tracing.py) instead of print. The default
+tracer is a no-op and the hot loop only builds events when it is enabled; pass
+ConsoleTracer() for the classic output or MemoryTracer()/JsonLinesTracer() for a log.
+v2.3.0: solve_batch(). Columnar forward inference: one float64 column per variable with a
+per-row "known" mask, each rule firing on all rows where it applies at once. Row by row
+it reaches the same facts as solve(); rows that never derive the target come out as NaN.
+v2.2.0: Compiled plans. compile(input_names, target) records the goal-directed firing
+sequence once as straight-line arithmetic (LRU-cached per graph version, input schema
+and target) and replays it on scalars or, vectorized, on NumPy columns.
+v2.1.0: Goal-directed mode. solve_backward() chains from the target to the rules that can
+produce it, proves only the subgoals those rules need (memoized), and returns the
+derivation plan alongside the value.
+v2.0.0: Indexed, worklist-driven fixpoint. Triads and additive laws are indexed by the
+variables they mention; learning a fact only revisits the rules that mention it. The
+visiting order reproduces the previous full sweeps (same facts, same step numbers),
+but total work is proportional to the rules actually touched, not steps × edges.
 """
 
-from typing import Dict, Optional
+import heapq
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
 from triadic_framework.core.network import TriadicNetwork
 from triadic_framework.core.triadic_engine import TriadicRelationalFramework as Triadic
 from triadic_framework.core.additive_laws import AdditiveLaw, ENERGY_CONSERVATION
+from triadic_framework.core.tracing import Tracer, NULL_TRACER
+from triadic_framework.core.rational import LazyRational
+
+LITERAL = -1  # rule id of a numeric label read as its own value
+
+def _is_literal(label: str) -> bool:
+    try:
+        float(label)
+        return True
+    except ValueError:
+        return False
+
+@dataclass(frozen=True)
+class DerivationStep:
+    """One rule firing: `output` computed by rule `rule` from `premises`."""
+    rule: int
+    output: str
+    premises: Tuple[str, ...]
+
+class RuleIndex:
+    """
+    Rule set of one inference run. Rule ids follow the sweep order of the original
+    engine: triads (graph edge order) first, then additive laws (list order).
+    `by_var[v]` lists (rule id, multiplicity of v among the rule's inputs).
+    `self_starting` lists the rules with at most one non-numeric variable, the only ones
+    that can fire before any of their variables is given or derived. `triad_literals` maps
+    each numeric triad label to the (law id, multiplicity) entries of the laws mentioning it.
+    """
+    def __init__(self, network: TriadicNetwork, additive_laws: List[AdditiveLaw]):
+        self.triads: List[Tuple[Tuple[str, str, str, str], int, int]] = list(network.iter_triads())
+        self.laws: List[AdditiveLaw] = list(additive_laws)
+        self.n_triads = len(self.triads)
+
+        self.by_var: Dict[str, List[Tuple[int, int]]] = {}
+        for r, (triad, _, _) in enumerate(self.triads):
+            for var, count in Counter(triad).items():
+                self.by_var.setdefault(var, []).append((r, count))
+        for j, law in enumerate(self.laws):
+            r = self.n_triads + j
+            parts = Counter(law.parts)
+            for var in parts.keys() | {law.total}:
+                self.by_var.setdefault(var, []).append((r, parts.get(var, 0)))
+        self.self_starting: List[int] = [
+            r for r, variables in enumerate([set(triad) for triad, _, _ in self.triads] +
+                                            [set(law.parts) | {law.total} for law in self.laws])
+            if sum(1 for var in variables if not _is_literal(var)) <= 1]
+        literals = dict.fromkeys(lbl for triad, _, _ in self.triads for lbl in triad if _is_literal(lbl))
+        self.triad_literals: Dict[str, List[Tuple[int, int]]] = {
+            lbl: [(r, count) for r, count in self.by_var[lbl] if r >= self.n_triads]
+            for lbl in literals}
+
+    def __len__(self) -> int:
+        return self.n_triads + len(self.laws)
+
+    def derivations(self, rule: int, output: str) -> List[Tuple[str, ...]]:
+        """Premises with which `rule` can produce `output` (empty if it cannot)."""
+        if rule < self.n_triads:
+            triad = self.triads[rule][0]
+            if triad.count(output) != 1:
+                return []
+            return [tuple(lbl for lbl in triad if lbl != output)]
+        law = self.laws[rule - self.n_triads]
+        if output == law.total:
+            return [] if output in law.parts else [tuple(law.parts)]
+        if law.parts.count(output) != 1:
+            return []
+        return [(law.total,) + tuple(p for p in law.parts if p != output)]
+
+    def describe(self, rule: int, output: str) -> Tuple[str, Any]:
+        """(kind, rule) of a firing for tracing: the triad labels or the law name."""
+        if rule == LITERAL:
+            return "literal", None
+        if rule < self.n_triads:
+            return "multiplicative", self.triads[rule][0]
+        law = self.laws[rule - self.n_triads]
+        return ("sum" if output == law.total else "subtraction"), law.name
+
+    def instruction(self, rule: int, output: str) -> tuple:
+        """
+        The arithmetic `evaluate` performs, as data:
+        ("const", out, value), ("ratio", out, num, x, y, den, z) for out = (num·x·y)/(den·z),
+        ("sum", out, parts) or ("diff", out, total, other_parts).
+        """
+        if rule == LITERAL:
+            return ("const", output, float(output))
+        if rule < self.n_triads:
+            (C1, C2, C3, C4), a, b = self.triads[rule]
+            if output == C1:
+                return ("ratio", output, a, C2, C3, b, C4)
+            if output == C4:
+                return ("ratio", output, a, C2, C3, b, C1)
+            if output == C2:
+                return ("ratio", output, b, C1, C4, a, C3)
+            return ("ratio", output, b, C1, C4, a, C2)
+        law = self.laws[rule - self.n_triads]
+        if output == law.total:
+            return ("sum", output, tuple(law.parts))
+        return ("diff", output, law.total, tuple(p for p in law.parts if p != output))
+
+    def evaluate(self, rule: int, output: str, known: Dict[str, float]) -> float:
+        """Value of `output` given the rule's other variables. May raise ZeroDivisionError."""
+        if rule == LITERAL:
+            return float(output)
+        if rule < self.n_triads:
+            (C1, C2, C3, C4), a, b = self.triads[rule]
+            # Universal solving algebra (C1, C2, C3 or C4)
+            if output == C1:
+                return (a * known[C2] * known[C3]) / (b * known[C4])
+            if output == C4:
+                return (a * known[C2] * known[C3]) / (b * known[C1])
+            if output == C2:
+                return (b * known[C1] * known[C4]) / (a * known[C3])
+            return (b * known[C1] * known[C4]) / (a * known[C2])
+        law = self.laws[rule - self.n_triads]
+        if output == law.total:
+            return sum(known[p] for p in law.parts)
+        return known[law.total] - sum(known[p] for p in law.parts if p != output)
+
+class CompiledPlan:
+    """
+    Straight-line replay of a derivation: each instruction is plain arithmetic on
+    named slots, in the order the rules fired when the plan was compiled.
+    """
+    def __init__(self, index: RuleIndex, input_names: Tuple[str, ...], target: str,
+                 steps: List[DerivationStep]):
+        self.input_names = input_names
+        self.target = target
+        self.steps = steps
+        self.program = [index.instruction(step.rule, step.output) for step in steps]
+
+    def __len__(self) -> int:
+        return len(self.program)
+
+    def execute(self, inputs: Dict[str, float]) -> Optional[float]:
+        """Value of the target for one set of inputs (None on a division by zero)."""
+        env = {name: float(inputs[name]) for name in self.input_names}
+        env['1'] = 1.0
+        try:
+            for op in self.program:
+                if op[0] == "ratio":
+                    _, out, num, x, y, den, z = op
+                    env[out] = (num * env[x] * env[y]) / (den * env[z])
+                elif op[0] == "sum":
+                    env[op[1]] = sum(env[p] for p in op[2])
+                elif op[0] == "diff":
+                    env[op[1]] = env[op[2]] - sum(env[p] for p in op[3])
+                else:
+                    env[op[1]] = op[2]
+        except ZeroDivisionError:
+            return None
+        return env[self.target]
+
+    def execute_batch(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Vectorized replay: one float64 column per input, one pass over the program.
+        Rows that divide by zero come out as NaN.
+        """
+        columns = {name: np.asarray(inputs[name], dtype=np.float64) for name in self.input_names}
+        n_rows = len(next(iter(columns.values()))) if columns else 1
+        env: Dict[str, np.ndarray] = dict(columns)
+        env['1'] = np.ones(n_rows)
+        for op in self.program:
+            if op[0] == "ratio":
+                _, out, num, x, y, den, z = op
+                denominator = den * env[z]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    value = (num * env[x] * env[y]) / denominator
+                env[out] = np.where(denominator == 0, np.nan, value)
+            elif op[0] == "sum":
+                env[op[1]] = sum(env[p] for p in op[2])
+            elif op[0] == "diff":
+                env[op[1]] = env[op[2]] - sum(env[p] for p in op[3])
+            else:
+                env[op[1]] = np.full(n_rows, op[2])
+        return np.broadcast_to(env[self.target], (n_rows,)).astype(np.float64)
 
 class GenericInferenceEngine:
-    def __init__(self, network: TriadicNetwork):
+    def __init__(self, network: TriadicNetwork, plan_cache_size: int = 128,
+                 tracer: Optional[Tracer] = None):
         self.net = network
+        self.tracer = tracer or NULL_TRACER
         self.triadic = Triadic()
         self.additive_laws = [ENERGY_CONSERVATION]
+        self._index: Optional[RuleIndex] = None
+        self._index_key = None
+        self.plan_cache_size = plan_cache_size
+        self._plans: "OrderedDict[tuple, CompiledPlan]" = OrderedDict()
 
-    def solve(self, inputs: Dict[str, float], target_var: str, max_steps: int = 10) -> Optional[float]:
-        known = {k: float(v) for k, v in inputs.items()}
-        
-        # Base rule: '1' is always 1.0
+    def _graph_version(self) -> tuple:
+        """Changes whenever the rule set may have changed (including direct edits to net.G)."""
+        return (self.net.state_key(), tuple(map(id, self.additive_laws)))
+
+    def _rule_index(self) -> RuleIndex:
+        """Rule index of the current graph and laws, rebuilt only when either changes."""
+        key = self._graph_version()
+        if self._index is None or key != self._index_key:
+            self._index = RuleIndex(self.net, self.additive_laws)
+            self._index_key = key
+        return self._index
+
+    def compile(self, input_names: Iterable[str], target_var: str) -> CompiledPlan:
+        """
+        Plan deriving `target_var` from any values of `input_names`, found once by goal-directed
+        chaining and cached (LRU) per (graph version, input schema, target).
+        Raises ValueError when the target cannot be derived from those inputs.
+        """
+        schema = tuple(sorted(set(input_names)))
+        key = (self._graph_version(), schema, target_var)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            return plan
+
+        index = self._rule_index()
+        # Only the firing order is recorded: the inputs stand in as opaque placeholders
+        known: Dict[str, Optional[float]] = {name: None for name in schema}
         known['1'] = 1.0
-        
-        print(f"\n--- HYBRID INFERENCE FOR {target_var} ---")
-        print(f"Initial data: {known}")
+        steps: List[DerivationStep] = []
+        if not self._prove(index, known, target_var, steps, evaluate=False):
+            raise ValueError(f"{target_var} cannot be derived from {list(schema)}")
+
+        plan = CompiledPlan(index, schema, target_var, steps)
+        self._plans[key] = plan
+        if len(self._plans) > self.plan_cache_size:
+            self._plans.popitem(last=False)
+        return plan
+
+    def solve(self, inputs: Dict[str, float], target_var: str, max_steps: int = 10,
+              exact: bool = False) -> Optional[float]:
+        """Forward inference. With exact=True values are LazyRational (ints/Fractions stay exact)."""
+        number = LazyRational.from_value if exact else float
+        known = {k: number(v) for k, v in inputs.items()}
+
+        # Base rule: '1' is always 1.0
+        known['1'] = number(1)
+
+        if self.tracer.enabled:
+            self.tracer.emit("start", mode="forward", target=target_var, known=dict(known))
+
+        return self._run(self._rule_index(), known, target_var, max_steps, number)
+
+    def session(self, inputs: Optional[Dict[str, float]] = None) -> 'InferenceSession':
+        """Persistent what-if session over this engine (see InferenceSession)."""
+        return InferenceSession(self, inputs)
+
+    def solve_backward(self, inputs: Dict[str, float], target_var: str,
+                       exact: bool = False) -> Tuple[Optional[float], List[DerivationStep]]:
+        """
+        Goal-directed inference: only the rules that can lead to `target_var` are visited.
+        Returns the value (None if underivable) and the plan, i.e. the rule firings in
+        evaluation order. When the data admit several derivations, the first one found
+        (rule-id order) is used, which may differ from the fact solve() reaches first.
+        Each proven fact keeps its first value, so on inconsistent data (a subgoal derivable
+        with different values) this can return None where solve() succeeds: if every rule
+        for a goal divides by zero with the chosen premise values, the other derivations of
+        those premises are not tried.
+        """
+        number = LazyRational.from_value if exact else float
+        known = {k: number(v) for k, v in inputs.items()}
+        known['1'] = number(1)
+
+        tracer = self.tracer
+        if tracer.enabled:
+            tracer.emit("start", mode="backward", target=target_var, known=dict(known))
+
+        plan: List[DerivationStep] = []
+        value = self._prove(self._rule_index(), known, target_var, plan, number=number)
+        if tracer.enabled:
+            if value is None:
+                tracer.emit("underivable", target=target_var)
+            else:
+                tracer.emit("derived", target=target_var, value=value, firings=len(plan))
+        return value, plan
+
+    def solve_batch(self, inputs: Dict[str, np.ndarray], target_var: str, max_steps: int = 10) -> np.ndarray:
+        """
+        Vectorized solve() over scenarios: `inputs` maps each variable to a column (NaN = not
+        given in that row). Rules fire on every row where exactly their output is missing,
+        in the same sweep order as solve(); rows dividing by zero skip the rule, as a
+        ZeroDivisionError does there. Returns the target column, NaN where underivable.
+        """
+        columns = {k: np.asarray(v, dtype=np.float64) for k, v in inputs.items()}
+        lengths = {len(col) for col in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Input columns have different lengths: {sorted(lengths)}")
+        n_rows = lengths.pop() if lengths else 1
+
+        index = self._rule_index()
+        values: Dict[str, np.ndarray] = {}
+        have: Dict[str, np.ndarray] = {}
+        for var, col in columns.items():
+            values[var] = col.copy()
+            have[var] = ~np.isnan(col)
+        values['1'], have['1'] = np.ones(n_rows), np.ones(n_rows, dtype=bool)
+        # Numeric labels of triads are learned by solve() before any rule needs them
+        for triad, _, _ in index.triads:
+            for lbl in triad:
+                if lbl not in values:
+                    try:
+                        literal = float(lbl)
+                    except ValueError:
+                        continue
+                    values[lbl], have[lbl] = np.full(n_rows, literal), np.ones(n_rows, dtype=bool)
+
+        def column(var: str):
+            if var not in values:
+                values[var], have[var] = np.full(n_rows, np.nan), np.zeros(n_rows, dtype=bool)
+            return values[var], have[var]
+
+        # A rule is revisited only if one of its variables changed since its last visit
+        clock = 1
+        stamp: Dict[str, int] = {var: clock for var in values}
+        visited = [0] * len(index)
+
+        def outputs(rule: int) -> List[Tuple[str, Tuple[str, ...]]]:
+            if rule < index.n_triads:
+                triad = index.triads[rule][0]
+                return [(out, premises) for out in dict.fromkeys(triad)
+                        for premises in index.derivations(rule, out)]
+            law = index.laws[rule - index.n_triads]
+            return [(out, premises) for out in dict.fromkeys([law.total] + list(law.parts))
+                    for premises in index.derivations(rule, out)]
+
+        rule_outputs = [outputs(r) for r in range(len(index))]
+        rule_vars = [{v for out, premises in outs for v in (out,) + premises} for outs in rule_outputs]
+
+        for step in range(1, max_steps + 1):
+            if target_var in have and have[target_var].all():
+                break
+            changed = False
+            for rule in range(len(index)):
+                if visited[rule] and all(stamp.get(v, 0) <= visited[rule] for v in rule_vars[rule]):
+                    continue
+                visited[rule] = clock
+                for out, premises in rule_outputs[rule]:
+                    out_val, out_have = column(out)
+                    rows = ~out_have
+                    for p in premises:
+                        rows &= column(p)[1]
+                    if not rows.any():
+                        continue
+
+                    op = index.instruction(rule, out)
+                    if op[0] == "ratio":
+                        _, _, num, x, y, den, z = op
+                        denominator = den * values[z][rows]
+                        ok = denominator != 0
+                        rows[rows] = ok
+                        if not ok.any():
+                            continue
+                        result = (num * values[x][rows] * values[y][rows]) / denominator[ok]
+                    elif op[0] == "sum":
+                        result = sum(values[p][rows] for p in op[2])
+                    else:
+                        result = values[op[2]][rows] - sum(values[p][rows] for p in op[3])
+
+                    out_val[rows] = result
+                    out_have[rows] = True
+                    clock += 1
+                    stamp[out] = clock
+                    changed = True
+            if not changed:
+                break
+
+        if target_var not in values:
+            return np.full(n_rows, np.nan)
+        return np.where(have[target_var], values[target_var], np.nan)
+
+    def _prove(self, index: RuleIndex, known: Dict[str, float], goal: str,
+               plan: List[DerivationStep], evaluate: bool = True, number=float):
+        """
+        Depth-first backward chaining with a memo of failed subgoals. A subgoal can fail
+        only because it sat on a cycle of the current proof, so the search is repeated
+        while a pass still derives new facts. With evaluate=False nothing is computed
+        (derived facts are marked None) and the return value is only a success flag.
+        Not complete under division by zero: a rule that raises ZeroDivisionError is
+        skipped, but the premises it used are not re-derived another way (see solve_backward).
+        """
+        def enter(var: str, stack: Set[str], failed: Set[str], frames: list) -> Optional[bool]:
+            """Result for a goal settled on the spot, or None after pushing its frame."""
+            if var in known:
+                return True
+            if var in failed or var in stack:
+                return False
+            try:
+                known[var] = number(var)
+                plan.append(DerivationStep(LITERAL, var, ()))
+                return True
+            except ValueError:
+                pass
+            stack.add(var)
+            alternatives = ((rule, premises) for rule, _ in index.by_var.get(var, ())
+                            for premises in index.derivations(rule, var))
+            # [goal, pending (rule, premises), current alternative, premises proven so far]
+            frames.append([var, alternatives, None, 0])
+            return None
+
+        def prove(goal: str, stack: Set[str], failed: Set[str]) -> bool:
+            # Explicit stack instead of recursion, so chain length is not bounded by the
+            # interpreter's recursion limit; goals are tried in the same depth-first order
+            frames: list = []
+            result = enter(goal, stack, failed, frames)
+            while frames:
+                frame = frames[-1]
+                var, alternatives, current, proven = frame
+                if result is False:
+                    current = None          # a premise failed: next alternative
+                elif result is True:
+                    proven += 1
+                result = None
+                if current is None:
+                    current = next(alternatives, None)
+                    proven = 0
+                    if current is None:
+                        stack.discard(var)
+                        failed.add(var)
+                        frames.pop()
+                        result = False
+                        continue
+                frame[2], frame[3] = current, proven
+                rule, premises = current
+                if proven < len(premises):
+                    result = enter(premises[proven], stack, failed, frames)
+                    continue
+                if evaluate:
+                    try:
+                        known[var] = index.evaluate(rule, var, known)
+                    except ZeroDivisionError:
+                        frame[2] = None
+                        continue
+                else:
+                    known[var] = None
+                plan.append(DerivationStep(rule, var, premises))
+                if evaluate and self.tracer.enabled:
+                    kind, label = index.describe(rule, var)
+                    self.tracer.emit("fact", fact=var, value=known[var], kind=kind,
+                                     rule=label, premises=premises, step=None)
+                stack.discard(var)
+                frames.pop()
+                result = True
+            return result
+
+        while True:
+            progress = len(plan)
+            if prove(goal, set(), set()):
+                return known[goal] if evaluate else True
+            if len(plan) == progress:
+                return None
+
+    def _run(self, index: RuleIndex, known: Dict[str, float], target_var: str, max_steps: int,
+             number=float) -> Optional[float]:
+        """
+        Semi-naive fixpoint. Each step pops dirty rules in rule-id order; a fact learned
+        while visiting rule r re-queues the rules that mention it, in this step if their
+        id is greater than r (the old sweep had not reached them yet) or in the next one
+        otherwise. This is exactly the order in which the full sweeps fired rules.
+        """
+        n_triads = index.n_triads
+        tracer = self.tracer
+        trace = tracer.enabled
+        # Unknown-input counters, computed on first touch
+        missing: Dict[int, int] = {}
+
+        def missing_count(r: int) -> int:
+            if r not in missing:
+                if r < n_triads:
+                    missing[r] = sum(1 for lbl in index.triads[r][0] if lbl not in known)
+                else:
+                    missing[r] = sum(1 for p in index.laws[r - n_triads].parts if p not in known)
+            return missing[r]
+
+        # Step 1 visits the rules the first full sweep could fire: those mentioning a given
+        # variable (or the target, to learn it if it is a literal) and the self-starting ones.
+        # Any other rule has two unknowns, and is queued once a fact it mentions is learned.
+        seeds = set(index.self_starting)
+        for var in [v for v in known if not _is_literal(v)] + [target_var]:
+            seeds.update(r for r, _ in index.by_var.get(var, ()))
+        current = sorted(seeds)
+        queued = set(current)
+        upcoming = set()
+        position = -1
+
+        def learn(var: str, value: float):
+            known[var] = value
+            for r, count in index.by_var.get(var, ()):
+                if r in missing:
+                    missing[r] -= count
+                if r > position:
+                    if r not in queued:
+                        queued.add(r)
+                        heapq.heappush(current, r)
+                elif r != position:
+                    upcoming.add(r)
 
         for step in range(1, max_steps + 1):
             # Success verification at start of cycle
             if target_var in known:
                 val = known[target_var]
-                display_val = int(val) if val.is_integer() else val
-                # UX Adjustment: If found in step 1, say "1 STEPS" (not 0)
-                print(f"SUCCESS IN {step} STEPS! {target_var} = {display_val}")
+                if trace:
+                    tracer.emit("success", target=target_var, value=val, step=step)
                 return val
-            
+
             changed = False
-            
-            # --- 1. MULTIPLICATIVE INFERENCE (Triads) ---
-            for _, _, data in self.net.G.edges(data=True):
-                triad = data.get('triad') 
-                if not triad: continue
-                
-                # On-the-fly literal learning
-                for lbl in triad:
-                    if lbl not in known:
+            heapq.heapify(current)
+            queued = set(current)
+            position = -1
+            # The first sweep had learned every numeric triad label before reaching the laws
+            literals_pending = step == 1 and bool(index.laws)
+
+            while current or literals_pending:
+                if literals_pending and (not current or current[0] >= n_triads):
+                    literals_pending = False
+                    for lbl, laws in index.triad_literals.items():
+                        if lbl in known:
+                            continue
                         try:
-                            known[lbl] = float(lbl)
+                            known[lbl] = number(lbl)
                         except ValueError:
-                            pass 
-
-                missing_list = [lbl for lbl in triad if lbl not in known]
-                
-                if len(missing_list) != 1:
-                    continue
-                
-                missing_lbl = missing_list[0]
-                vals = {lbl: known[lbl] for lbl in triad if lbl in known}
-                
-                try:
-                    a, b = data['a'], data['b']
-                    C1, C2, C3, C4 = triad
-                    val_calculated = None
-                    
-                    # Universal solving algebra (C1, C2, C3 or C4)
-                    if missing_lbl == C1:
-                        val_calculated = (a * vals[C2] * vals[C3]) / (b * vals[C4])
-                    elif missing_lbl == C4:
-                        val_calculated = (a * vals[C2] * vals[C3]) / (b * vals[C1])
-                    elif missing_lbl == C2:
-                        val_calculated = (b * vals[C1] * vals[C4]) / (a * vals[C3])
-                    elif missing_lbl == C3:
-                        val_calculated = (b * vals[C1] * vals[C4]) / (a * vals[C2])
-
-                    if val_calculated is not None:
-                        known[missing_lbl] = val_calculated
-                        changed = True
-                        print(f"Step {step} (Multiplicative): {missing_lbl} = {val_calculated:.2f}  [Solving for {triad}]")
-                        
-                except ZeroDivisionError:
+                            continue
+                        for r, count in laws:
+                            if r in missing:
+                                missing[r] -= count
+                            if r not in queued:
+                                queued.add(r)
+                                heapq.heappush(current, r)
                     continue
+                position = heapq.heappop(current)
+                queued.discard(position)
 
-            # --- 2. ADDITIVE INFERENCE (Explicit Logic) ---
-            for law in self.additive_laws:
-                # Branch A: Calculate TOTAL (Sum / Integral)
-                if law.total not in known:
-                    if all(p in known for p in law.parts):
-                        total_val = sum(known[p] for p in law.parts)
-                        known[law.total] = total_val
-                        changed = True
-                        print(f"Step {step} (Additive - Sum): {law.total} = {total_val:.2f}")
-
-                # Branch B: Calculate a PART (Subtraction / Differential)
-                if law.total in known:
-                    total_val = known[law.total]
-                    missing_parts = [p for p in law.parts if p not in known]
-                    
-                    if len(missing_parts) == 1:
-                        missing_part = missing_parts[0]
-                        known_parts_sum = sum(known[p] for p in law.parts if p in known)
-                        val_part = total_val - known_parts_sum
-                        
-                        known[missing_part] = val_part
+                if position < n_triads:
+                    # --- 1. MULTIPLICATIVE INFERENCE (Triads) ---
+                    triad = index.triads[position][0]
+
+                    # On-the-fly literal learning
+                    for lbl in triad:
+                        if lbl not in known:
+                            try:
+                                literal = number(lbl)
+                            except ValueError:
+                                continue
+                            learn(lbl, literal)
+
+                    if missing_count(position) != 1:
+                        continue
+
+                    missing_lbl = next(lbl for lbl in triad if lbl not in known)
+                    try:
+                        val_calculated = index.evaluate(position, missing_lbl, known)
+                    except ZeroDivisionError:
+                        continue
+
+                    learn(missing_lbl, val_calculated)
+                    changed = True
+                    if trace:
+                        tracer.emit("fact", fact=missing_lbl, value=val_calculated, kind="multiplicative",
+                                    rule=triad, premises=tuple(l for l in triad if l != missing_lbl), step=step)
+
+                else:
+                    # --- 2. ADDITIVE INFERENCE (Explicit Logic) ---
+                    law = index.laws[position - n_triads]
+
+                    # Branch A: Calculate TOTAL (Sum / Integral)
+                    if law.total not in known:
+                        if missing_count(position) == 0:
+                            total_val = index.evaluate(position, law.total, known)
+                            learn(law.total, total_val)
+                            changed = True
+                            if trace:
+                                tracer.emit("fact", fact=law.total, value=total_val, kind="sum",
+                                            rule=law.name, premises=tuple(law.parts), step=step)
+
+                    # Branch B: Calculate a PART (Subtraction / Differential)
+                    elif missing_count(position) == 1:
+                        missing_part = next(p for p in law.parts if p not in known)
+                        val_part = index.evaluate(position, missing_part, known)
+
+                        learn(missing_part, val_part)
                         changed = True
-                        print(f"Step {step} (Additive - Subtraction): {missing_part} = {val_part:.2f}")
+                        if trace:
+                            tracer.emit("fact", fact=missing_part, value=val_part, kind="subtraction", rule=law.name,
+                                        premises=(law.total,) + tuple(p for p in law.parts if p != missing_part), step=step)
 
             if not changed:
-                print(f"Inference stopped at step {step}: No more facts can be deduced.")
+                if trace:
+                    tracer.emit("stopped", target=target_var, step=step)
                 break
-            
-        return known.get(target_var)
\ No newline at end of file
+
+            current = list(upcoming)
+            upcoming = set()
+
+        return known.get(target_var)
+
+class InferenceSession:
+    """
+    Spreadsheet-style inference: inputs are cells, derived facts are formulas.
+    Every derived fact remembers the rule and premises it came from; changing or removing
+    an input drops exactly the facts that (transitively) depend on it, and get() re-derives
+    only what is missing. Changes to the graph or the law list reset all derived facts.
+    """
+    def __init__(self, engine: GenericInferenceEngine, inputs: Optional[Dict[str, float]] = None):
+        self.engine = engine
+        self.inputs: Dict[str, float] = {}
+        self.values: Dict[str, float] = {'1': 1.0}
+        self.provenance: Dict[str, DerivationStep] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._version = engine._graph_version()
+        for name, value in (inputs or {}).items():
+            self.set(name, value)
+
+    def set(self, name: str, value: float):
+        """Sets (or overrides) an input; dependents are invalidated only if the value changed."""
+        value = float(value)
+        if self.inputs.get(name) == value and name in self.values:
+            return
+        self._invalidate(name)
+        self.provenance.pop(name, None)
+        self.inputs[name] = value
+        self.values[name] = value
+
+    def update(self, inputs: Dict[str, float]):
+        for name, value in inputs.items():
+            self.set(name, value)
+
+    def remove(self, name: str):
+        """Forgets an input and everything derived from it."""
+        if name in self.inputs:
+            self._invalidate(name)
+            del self.inputs[name]
+            del self.values[name]
+
+    def get(self, target_var: str) -> Optional[float]:
+        """
+        Value of `target_var`, reusing every still-valid derived fact. Derived by goal-directed
+        chaining, with the same limitation on inconsistent data as solve_backward().
+        """
+        self._check_graph()
+        if target_var in self.values:
+            return self.values[target_var]
+        steps: List[DerivationStep] = []
+        value = self.engine._prove(self.engine._rule_index(), self.values, target_var, steps)
+        for step in steps:
+            self.provenance[step.output] = step
+            for premise in step.premises:
+                self._dependents.setdefault(premise, set()).add(step.output)
+        return value
+
+    def explain(self, target_var: str) -> List[DerivationStep]:
+        """Derivation of a known fact, premises first (empty for inputs and unknowns)."""
+        plan: List[DerivationStep] = []
+        seen: Set[str] = set()
+
+        def visit(var: str):
+            if var in seen or var not in self.provenance:
+                return
+            seen.add(var)
+            step = self.provenance[var]
+            for premise in step.premises:
+                visit(premise)
+            plan.append(step)
+
+        visit(target_var)
+        return plan
+
+    def _invalidate(self, name: str):
+        stale = []
+        stack = list(self._dependents.pop(name, ()))
+        while stack:
+            var = stack.pop()
+            if var not in self.provenance:
+                continue
+            step = self.provenance.pop(var)
+            del self.values[var]
+            stale.append(var)
+            for premise in step.premises:
+                if premise in self._dependents:
+                    self._dependents[premise].discard(var)
+            stack.extend(self._dependents.pop(var, ()))
+        if stale and self.engine.tracer.enabled:
+            self.engine.tracer.emit("invalidated", cause=name, facts=stale)
+
+    def _check_graph(self):
+        version = self.engine._graph_version()
+        if version != self._version:
+            self._version = version
+            self.values = {'1': 1.0, **self.inputs}
+            self.provenance.clear()
+            self._dependents.clear()
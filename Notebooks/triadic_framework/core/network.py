@@ -1,26 +1,210 @@
 """
-network.py v5.1 – 2025-11-19
-UPDATE: Visualization with community detection (Louvain/Greedy) to see physics branches.
+network.py v5.4 – 2026-10-17
+UPDATE: add_candidate_quartets() screens candidates in chunks (bulk search + dimension check),
+optionally on a process pool, then inserts the accepted triads in input order in one pass
+and reports rejection counts per reason.
+v5.3: Triads live in a columnar TriadStore. `G` is a networkx view built on first access
+(visualize/save_graph or scripts editing it) and kept in sync incrementally; direct edits
+to it persist. The inference engine reads triads from the store while no view exists.
+v5.2: Accepted triads are reported through a tracer (silent by default) instead of print.
+v5.1: Visualization with community detection (Louvain/Greedy) to see physics branches.
 """
 
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 import networkx as nx
 import matplotlib.pyplot as plt
-from typing import Tuple
-from triadic_framework.core.triadic_search import auto_discover_best_triplet
-from triadic_framework.core.dimensional_units import UNITS_MAP
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from triadic_framework.core.triadic_search import auto_discover_best_triplet, auto_discover_best_triplets
+from triadic_framework.core.dimensional_units import UNITS_MAP, unit_codes, balance_mask
+from triadic_framework.core.tracing import Tracer, NULL_TRACER
+from triadic_framework.core.triad_store import TriadStore
+
+REJECTION_REASONS = ("invalid", "low_K", "dimension")
+
+def _dimensionally_balanced(labels: Tuple[str, str, str, str], units_map: Dict[str, Any]) -> bool:
+    try:
+        u1, u2, u3, u4 = [units_map.get(l) for l in labels]
+        if None in (u1, u2, u3, u4): 
+            return True 
+        return (u1 * u4) == (u2 * u3)
+    except:
+        return True
+
+def _screen_quartets(chunk: List[Tuple[Tuple[int, int, int, int], Tuple[str, str, str, str]]],
+                     min_K: float, units_map: Dict[str, Any]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Worker side of add_candidate_quartets: (result, None) if accepted, else (None, reason)."""
+    values = [tuple(v) for v, _ in chunk]
+    labels = [tuple(l) for _, l in chunk]
+    results = auto_discover_best_triplets(values, labels)
+    passed = [i for i, r in enumerate(results) if r and r["K"] >= min_K]
+    # One balance_mask over the unit codes of all surviving ordered quartets
+    codes = unit_codes([[results[i][c] for c in ("C1", "C2", "C3", "C4")] for i in passed], units_map)
+    balanced = dict(zip(passed, balance_mask(*codes.reshape(-1, 4).T).tolist())) if passed else {}
+
+    screened = []
+    for i, result in enumerate(results):
+        if not result:
+            screened.append((None, "invalid"))
+        elif result["K"] < min_K:
+            screened.append((None, "low_K"))
+        elif not balanced[i]:
+            screened.append((None, "dimension"))
+        else:
+            screened.append((result, None))
+    return screened
+
+class _EdgeData(dict):
+    """Edge attribute dict that counts writes into its graph's mutation counter."""
+    def _touch(self):
+        counter = getattr(self, "counter", None)  # unset while unpickling
+        if counter is not None:
+            counter[0] += 1
+
+    def __setitem__(self, key, value):
+        self._touch()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._touch()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._touch()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._touch()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._touch()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._touch()
+        return super().popitem()
+
+    def clear(self):
+        self._touch()
+        super().clear()
+
+class _EdgeDataFactory:
+    def __init__(self, counter: List[int]):
+        self.counter = counter
+
+    def __call__(self) -> _EdgeData:
+        data = _EdgeData()
+        data.counter = self.counter
+        return data
+
+class TrackedDiGraph(nx.DiGraph):
+    """
+    DiGraph whose `mutations` counter grows on every edge change: adding or removing edges
+    or nodes with edges, and writes to edge attributes (G.edges[u, v]['a'] = ...).
+    Lets caches built on the graph be validated in O(1).
+    """
+    def __init__(self, incoming_graph_data=None, **attr):
+        self._mutations = [0]
+        self.edge_attr_dict_factory = _EdgeDataFactory(self._mutations)
+        super().__init__(incoming_graph_data, **attr)
+
+    @property
+    def mutations(self) -> int:
+        return self._mutations[0]
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self._mutations[0] += 1
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        self._mutations[0] += 1
+        super().add_edges_from(ebunch_to_add, **attr)
+
+    def remove_edge(self, u, v):
+        self._mutations[0] += 1
+        super().remove_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        self._mutations[0] += 1
+        super().remove_edges_from(ebunch)
+
+    def remove_node(self, n):
+        self._mutations[0] += 1
+        super().remove_node(n)
+
+    def remove_nodes_from(self, nodes):
+        self._mutations[0] += 1
+        super().remove_nodes_from(nodes)
+
+    def clear(self):
+        self._mutations[0] += 1
+        super().clear()
+
+    def clear_edges(self):
+        self._mutations[0] += 1
+        super().clear_edges()
 
 class TriadicNetwork:
-    def __init__(self):
-        self.G = nx.DiGraph()
+    def __init__(self, tracer: Optional[Tracer] = None):
+        self.triads = TriadStore()
+        self._G: Optional[nx.DiGraph] = None
+        self._synced = 0          # store rows already mirrored in _G
+        self._resynced = set()    # overwritten rows whose edge attributes are stale in _G
+        self.tracer = tracer or NULL_TRACER
+        # Bumped on every accepted triad; caches built on the graph compare against it
+        self.version = 0
+
+    @property
+    def G(self) -> nx.DiGraph:
+        """networkx view of the network, materialized on first use and then kept in sync."""
+        if self._G is None:
+            self._G = TrackedDiGraph()
+        if self._synced < len(self.triads) or self._resynced:
+            self._sync()
+        return self._G
+
+    @G.setter
+    def G(self, graph: nx.DiGraph):
+        """Assigned graphs are copied into a TrackedDiGraph, so later edits reach state_key()."""
+        self._G = graph if isinstance(graph, TrackedDiGraph) else TrackedDiGraph(graph)
+        self._synced = len(self.triads)
+        self._resynced.clear()
+
+    def _sync(self):
+        store, G = self.triads, self._G
+        rows = sorted(self._resynced) + list(range(self._synced, len(store)))
+        for row in rows:
+            C1, C2, C3, C4 = store.labels(row)
+            a, b, K = int(store.a[row]), int(store.b[row]), float(store.K[row])
+            G.add_nodes_from((C1, C2, C3, C4))
+            G.add_edge(f"{C1},{C2},{C3}", C4, triad=(C1, C2, C3, C4), a=a, b=b, K=K,
+                       label=f"{C1}·{C4}={a}/{b}·{C2}·{C3}")
+        self._synced = len(store)
+        self._resynced.clear()
+
+    def iter_triads(self) -> Iterator[Tuple[Tuple[str, str, str, str], int, int]]:
+        """(triad, a, b) in graph edge order; includes triad edges added to G by hand."""
+        if self._G is None:
+            for triad, a, b, _ in self.triads:
+                yield triad, a, b
+            return
+        for _, _, data in self.G.edges(data=True):
+            triad = data.get('triad')
+            if triad:
+                yield tuple(triad), data['a'], data['b']
+
+    def state_key(self) -> tuple:
+        """
+        Changes whenever the triad set may have changed, including direct edits to G
+        (counted by TrackedDiGraph), in O(1).
+        """
+        return (self.version, len(self.triads), -1 if self._G is None else self.G.mutations)
 
     def check_dimensional_balance(self, labels: Tuple[str, str, str, str]) -> bool:
-        try:
-            u1, u2, u3, u4 = [UNITS_MAP.get(l) for l in labels]
-            if None in (u1, u2, u3, u4): 
-                return True 
-            return (u1 * u4) == (u2 * u3)
-        except:
-            return True
+        return _dimensionally_balanced(labels, UNITS_MAP)
 
     def add_candidate_quartet(self, values: Tuple[int, int, int, int], labels: Tuple[str, str, str, str], min_K: float = 0.9):
         result = auto_discover_best_triplet(values, labels)
@@ -32,19 +216,60 @@ class TriadicNetwork:
             if not self.check_dimensional_balance(ordered_labels):
                 return
 
-            K = result["K"]
-            a, b = map(int, result["a/b"].split('/'))
-            
-            for lbl in labels: self.G.add_node(lbl)
-            
-            self.G.add_edge(f"{C1_lbl},{C2_lbl},{C3_lbl}", C4_lbl,
-                            triad=ordered_labels, a=a, b=b, K=K,
-                            label=f"{C1_lbl}·{C4_lbl}={a}/{b}·{C2_lbl}·{C3_lbl}")
-            
-            print(f"Triad Accepted (K={K}): {result['equation']}")
+            self._insert(result)
+            self.version += 1
         else:
             pass
 
+    def _insert(self, result: Dict[str, Any]):
+        ordered_labels = (result["C1"], result["C2"], result["C3"], result["C4"])
+        K = result["K"]
+        a, b = map(int, result["a/b"].split('/'))
+        row, is_new = self.triads.add(ordered_labels, a, b, K)
+        if not is_new and row < self._synced:
+            self._resynced.add(row)
+
+        if self.tracer.enabled:
+            self.tracer.emit("triad_accepted", triad=ordered_labels, a=a, b=b, K=K, equation=result['equation'])
+
+    def add_candidate_quartets(self, candidates: Iterable[Tuple[Tuple[int, int, int, int], Tuple[str, str, str, str]]],
+                               min_K: float = 0.9, workers: Optional[int] = None,
+                               chunk_size: int = 4096) -> Dict[str, int]:
+        """
+        Bulk add_candidate_quartet over (values, labels) pairs. Chunks are screened with the
+        vectorized search and the dimension check, on `workers` processes (default: all
+        cores; 1 = in this process). Accepted triads are inserted in input order, so the
+        graph is the same as with one add_candidate_quartet call per candidate.
+        Returns counts: accepted plus one entry per rejection reason.
+        """
+        it = iter(candidates)
+        chunks = []
+        while True:
+            chunk = list(islice(it, chunk_size))
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        workers = workers or os.cpu_count() or 1
+        units_map = dict(UNITS_MAP)  # snapshot: callers extend UNITS_MAP at runtime
+        if workers <= 1 or len(chunks) <= 1:
+            screened = [_screen_quartets(chunk, min_K, units_map) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                screened = list(pool.map(_screen_quartets, chunks, repeat(min_K), repeat(units_map)))
+
+        counts = Counter({reason: 0 for reason in ("accepted",) + REJECTION_REASONS})
+        for chunk_results in screened:
+            for result, reason in chunk_results:
+                if result is None:
+                    counts[reason] += 1
+                else:
+                    self._insert(result)
+                    counts["accepted"] += 1
+        if counts["accepted"]:
+            self.version += 1
+        return dict(counts)
+
     def save_graph(self, filename: str):
         """Saves the current graph to a GraphML file."""
         try:
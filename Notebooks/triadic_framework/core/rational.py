@@ -0,0 +1,185 @@
+"""
+rational.py v1.0.0 – 2026-10-17
+UPDATE: LazyRational, an exact numerator/denominator pair for the inference engine's exact mode.
+Unlike fractions.Fraction it does not reduce after every operation: the gcd is taken only
+when a component grows past `REDUCE_BITS` or when the value is shown.
+Additions over a shared denominator (Riemann sums) skip the cross-multiplication entirely.
+"""
+
+from __future__ import annotations
+import math
+from fractions import Fraction
+from numbers import Integral, Rational, Real
+from typing import Union
+
+REDUCE_BITS = 256
+
+Number = Union[int, float, Fraction, 'LazyRational']
+
+class LazyRational:
+    __slots__ = ("num", "den")
+
+    def __init__(self, num: int = 0, den: int = 1):
+        if den == 0:
+            raise ZeroDivisionError("LazyRational with zero denominator")
+        if den < 0:
+            num, den = -num, -den
+        self.num = num
+        self.den = den
+
+    @classmethod
+    def _raw(cls, num: int, den: int) -> LazyRational:
+        """Constructor for already-signed components; reduces only past the bit threshold."""
+        r = object.__new__(cls)
+        if num.bit_length() > REDUCE_BITS or den.bit_length() > REDUCE_BITS:
+            g = math.gcd(num, den)
+            if g > 1:
+                num //= g
+                den //= g
+        r.num = num
+        r.den = den
+        return r
+
+    @classmethod
+    def from_value(cls, value: Number) -> LazyRational:
+        """Exact conversion. Floats and strings are read as the decimal they print as (0.1 -> 1/10)."""
+        if isinstance(value, LazyRational):
+            return value
+        # NumPy scalars register as Integral/Real but are not int/float; coerce to Python numbers
+        if isinstance(value, Integral):
+            return cls._raw(int(value), 1)
+        if isinstance(value, Rational):
+            return cls._raw(int(value.numerator), int(value.denominator))
+        if isinstance(value, Real):
+            value = repr(float(value))
+        f = Fraction(value)
+        return cls._raw(f.numerator, f.denominator)
+
+    def reduced(self) -> LazyRational:
+        g = math.gcd(self.num, self.den)
+        if g > 1:
+            self.num //= g
+            self.den //= g
+        return self
+
+    def to_fraction(self) -> Fraction:
+        return Fraction(self.num, self.den)
+
+    # --- Arithmetic ---
+
+    @staticmethod
+    def _parts(other):
+        if isinstance(other, LazyRational):
+            return other.num, other.den
+        if isinstance(other, int):
+            return other, 1
+        if isinstance(other, Rational):
+            return other.numerator, other.denominator
+        return None
+
+    def __add__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) + other if isinstance(other, float) else NotImplemented
+        n, d = p
+        if d == self.den:
+            return LazyRational._raw(self.num + n, d)
+        return LazyRational._raw(self.num * d + n * self.den, self.den * d)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) - other if isinstance(other, float) else NotImplemented
+        n, d = p
+        if d == self.den:
+            return LazyRational._raw(self.num - n, d)
+        return LazyRational._raw(self.num * d - n * self.den, self.den * d)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) * other if isinstance(other, float) else NotImplemented
+        return LazyRational._raw(self.num * p[0], self.den * p[1])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) / other if isinstance(other, float) else NotImplemented
+        n, d = p
+        if n == 0:
+            raise ZeroDivisionError("LazyRational division by zero")
+        if n < 0:
+            n, d = -n, -d
+        return LazyRational._raw(self.num * d, self.den * n)
+
+    def __rtruediv__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return other / float(self) if isinstance(other, float) else NotImplemented
+        return LazyRational.from_value(Fraction(*p)) / self
+
+    def __neg__(self):
+        return LazyRational._raw(-self.num, self.den)
+
+    def __abs__(self):
+        return LazyRational._raw(abs(self.num), self.den)
+
+    # --- Comparison / conversion ---
+
+    def __eq__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) == other if isinstance(other, float) else NotImplemented
+        return self.num * p[1] == p[0] * self.den
+
+    def __lt__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) < other if isinstance(other, float) else NotImplemented
+        return self.num * p[1] < p[0] * self.den
+
+    def __le__(self, other):
+        return self == other or self < other
+
+    def __gt__(self, other):
+        p = self._parts(other)
+        if p is None:
+            return float(self) > other if isinstance(other, float) else NotImplemented
+        return self.num * p[1] > p[0] * self.den
+
+    def __ge__(self, other):
+        return self == other or self > other
+
+    def __hash__(self):
+        return hash(self.to_fraction())
+
+    def __bool__(self):
+        return self.num != 0
+
+    def __float__(self):
+        return self.num / self.den  # correctly rounded for big ints too
+
+    def __int__(self):
+        q = abs(self.num) // self.den  # truncates toward zero, like int(float)
+        return q if self.num >= 0 else -q
+
+    def is_integer(self) -> bool:
+        return self.num % self.den == 0
+
+    def __format__(self, spec: str) -> str:
+        return format(float(self), spec)
+
+    def __repr__(self):
+        self.reduced()
+        return f"LazyRational({self.num}, {self.den})"
+
+    def __str__(self):
+        self.reduced()
+        return str(self.num) if self.den == 1 else f"{self.num}/{self.den}"
@@ -0,0 +1,112 @@
+"""
+tracing.py v1.0.0 – 2026-10-17
+UPDATE: Pluggable tracing for the network and the inference engine.
+Tracer (the default) does nothing and callers skip building events when `enabled` is False.
+MemoryTracer keeps a derivation log, JsonLinesTracer streams it to a file and
+ConsoleTracer prints the classic human-readable messages.
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, TextIO, Union
+
+class Tracer:
+    """No-op tracer. Subclasses set `enabled = True` and override `record`."""
+    enabled = False
+
+    def __init__(self):
+        self._t0 = time.perf_counter_ns()
+
+    def emit(self, event: str, **data: Any):
+        if not self.enabled:
+            return
+        if event == "start":
+            self._t0 = time.perf_counter_ns()
+        self.record({"event": event, "elapsed_ns": time.perf_counter_ns() - self._t0, **data})
+
+    def record(self, entry: Dict[str, Any]):
+        pass
+
+NULL_TRACER = Tracer()
+
+class MemoryTracer(Tracer):
+    """In-memory derivation log: one dict per event (fact, rule, step, elapsed_ns, ...)."""
+    enabled = True
+
+    def __init__(self):
+        super().__init__()
+        self.events: List[Dict[str, Any]] = []
+
+    def record(self, entry: Dict[str, Any]):
+        self.events.append(entry)
+
+    @property
+    def facts(self) -> List[Dict[str, Any]]:
+        return [e for e in self.events if e["event"] == "fact"]
+
+    def clear(self):
+        self.events.clear()
+
+class JsonLinesTracer(Tracer):
+    """Writes every event as one JSON object per line (path or open text stream)."""
+    enabled = True
+
+    def __init__(self, sink: Union[str, TextIO]):
+        super().__init__()
+        self._owned = isinstance(sink, str)
+        self.stream: TextIO = open(sink, "a", encoding="utf-8") if self._owned else sink
+
+    def record(self, entry: Dict[str, Any]):
+        self.stream.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        if self._owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ConsoleTracer(Tracer):
+    """Human-readable output, identical to the messages the engine used to print."""
+    enabled = True
+
+    def record(self, entry: Dict[str, Any]):
+        line = self.format(entry)
+        if line is not None:
+            print(line)
+
+    @staticmethod
+    def _display(value: float):
+        return int(value) if value.is_integer() else value
+
+    def format(self, e: Dict[str, Any]) -> Optional[str]:
+        event = e["event"]
+        if event == "start":
+            title = "GOAL-DIRECTED INFERENCE" if e.get("mode") == "backward" else "HYBRID INFERENCE"
+            return f"\n--- {title} FOR {e['target']} ---\nInitial data: {e['known']}"
+        if event == "fact":
+            where = f"Step {e['step']}" if e.get("step") is not None else "Subgoal"
+            if e["kind"] == "multiplicative":
+                return f"{where} (Multiplicative): {e['fact']} = {e['value']:.2f}  [Solving for {e['rule']}]"
+            if e["kind"] == "sum":
+                return f"{where} (Additive - Sum): {e['fact']} = {e['value']:.2f}"
+            if e["kind"] == "subtraction":
+                return f"{where} (Additive - Subtraction): {e['fact']} = {e['value']:.2f}"
+            return None  # literals are not worth a line
+        if event == "success":
+            # UX Adjustment: If found in step 1, say "1 STEPS" (not 0)
+            return f"SUCCESS IN {e['step']} STEPS! {e['target']} = {self._display(e['value'])}"
+        if event == "stopped":
+            return f"Inference stopped at step {e['step']}: No more facts can be deduced."
+        if event == "derived":
+            return f"DERIVED IN {e['firings']} RULE FIRINGS! {e['target']} = {self._display(e['value'])}"
+        if event == "underivable":
+            return f"Goal-directed inference failed: {e['target']} cannot be derived."
+        if event == "triad_accepted":
+            return f"Triad Accepted (K={e['K']}): {e['equation']}"
+        return None
@@ -0,0 +1,105 @@
+"""
+triad_store.py v1.0.0 – 2026-10-17
+UPDATE: Columnar storage for accepted triads. Variable names are interned once; each triad is
+one row of an int32 (n, 4) id matrix plus a, b and K columns, grown by doubling.
+Re-adding the same ordered quartet overwrites its row, like re-adding a graph edge did.
+"""
+
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+class TriadStore:
+    def __init__(self, capacity: int = 1024):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        capacity = max(1, capacity)
+        self._C = np.empty((capacity, 4), dtype=np.int32)
+        self._a = np.empty(capacity, dtype=np.int64)
+        self._b = np.empty(capacity, dtype=np.int64)
+        self._K = np.empty(capacity, dtype=np.float64)
+        # First-appearance rank of the (C1, C2, C3) source, to reproduce graph edge order
+        self._rank = np.empty(capacity, dtype=np.int64)
+        self._sources: Dict[Tuple[int, int, int], int] = {}
+        self._rows: Dict[Tuple[int, int, int, int], int] = {}
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def intern(self, name: str) -> int:
+        idx = self.ids.get(name)
+        if idx is None:
+            idx = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    @property
+    def C(self) -> np.ndarray:
+        return self._C[:self._n]
+
+    @property
+    def a(self) -> np.ndarray:
+        return self._a[:self._n]
+
+    @property
+    def b(self) -> np.ndarray:
+        return self._b[:self._n]
+
+    @property
+    def K(self) -> np.ndarray:
+        return self._K[:self._n]
+
+    def _grow(self):
+        capacity = 2 * len(self._K)
+        for attr in ("_C", "_a", "_b", "_K", "_rank"):
+            old = getattr(self, attr)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, attr, new)
+
+    def _store_ratio(self, row: int, a: int, b: int):
+        if self._a.dtype != object and (abs(a) > _INT64_MAX or abs(b) > _INT64_MAX):
+            # Reduced ratios beyond 64 bits: keep exact Python ints from now on
+            self._a, self._b = self._a.astype(object), self._b.astype(object)
+        self._a[row], self._b[row] = a, b
+
+    def add(self, labels: Tuple[str, str, str, str], a: int, b: int, K: float) -> Tuple[int, bool]:
+        """Stores C1·C4 = a/b·C2·C3. Returns (row, True if new / False if overwritten)."""
+        key = tuple(self.intern(lbl) for lbl in labels)
+        row = self._rows.get(key)
+        is_new = row is None
+        if is_new:
+            if self._n == len(self._K):
+                self._grow()
+            row = self._n
+            self._n += 1
+            self._rows[key] = row
+            self._C[row] = key
+            self._rank[row] = self._sources.setdefault(key[:3], len(self._sources))
+        self._store_ratio(row, a, b)
+        self._K[row] = K
+        return row, is_new
+
+    def labels(self, row: int) -> Tuple[str, str, str, str]:
+        names = self.names
+        return tuple(names[i] for i in self._C[row].tolist())
+
+    def graph_order(self) -> np.ndarray:
+        """Rows in the order a DiGraph built from them iterates its edges (grouped by source)."""
+        rows = np.arange(self._n)
+        return rows[np.lexsort((rows, self._rank[:self._n]))]
+
+    def __iter__(self) -> Iterator[Tuple[Tuple[str, str, str, str], int, int, float]]:
+        """(labels, a, b, K) in graph edge order."""
+        names = self.names
+        order = self.graph_order()
+        C = self._C[order].tolist()
+        a, b, K = self._a[order].tolist(), self._b[order].tolist(), self._K[order].tolist()
+        for ids, ai, bi, Ki in zip(C, a, b, K):
+            yield (names[ids[0]], names[ids[1]], names[ids[2]], names[ids[3]]), ai, bi, Ki
+
+    def nbytes(self) -> int:
+        n = self._n
+        return int(self._C[:n].nbytes + self._a[:n].nbytes + self._b[:n].nbytes + self._K[:n].nbytes + self._rank[:n].nbytes)
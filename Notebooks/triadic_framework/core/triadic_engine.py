@@ -1,6 +1,6 @@
 """
-triadic_engine.py v1.1.1 – 2025-11-19
-UPDATE: Fix ZeroDivisionError cuando los inputs son cero (manejo de K).
+triadic_engine.py v1.2.0 – 2026-10-17
+UPDATE: Vectorized discovery_batch over NumPy columns (int64 fast path, Python int fallback on overflow).
 """
 
 from __future__ import annotations
@@ -9,6 +9,7 @@ from fractions import Fraction
 from typing import Dict
 from dataclasses import dataclass
 import logging
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +22,17 @@ class TriadicResult:
     b: int
     steps: Dict[str, any]
 
+@dataclass
+class TriadicBatchResult:
+    """Column-wise counterpart of TriadicResult (one row per quartet)."""
+    output: np.ndarray
+    simplicity: np.ndarray  # float64 K; 0.0 for a == 0 and for invalid rows
+    a: np.ndarray           # int64, or object if some reduced row exceeds 64 bits
+    b: np.ndarray
+    valid: np.ndarray       # False where discovery() would raise (C2 or C3 zero)
+
+_INT64_MAX = np.iinfo(np.int64).max
+
 class TriadicRelationalFramework:
     @staticmethod
     def discovery(C1: int, C2: int, C3: int, C4: int) -> TriadicResult:
@@ -49,6 +61,56 @@ class TriadicRelationalFramework:
 
         K = Fraction(1, a * b)
         return TriadicResult(C4, K, a, b, {"a": a, "b": b, "K": str(K)})
+
+    @staticmethod
+    def discovery_batch(C1, C2, C3, C4) -> TriadicBatchResult:
+        """
+        Vectorized discovery() over integer columns C1..C4.
+        Rows whose products C1'·C4' or C2'·C3' overflow int64 are solved
+        one by one with Python ints through discovery().
+        """
+        cols = [np.asarray(c) for c in (C1, C2, C3, C4)]
+        for c in cols:
+            if c.dtype.kind not in "iu" or not np.can_cast(c.dtype, np.int64):
+                raise ValueError("Inputs must be int64-compatible integer arrays")
+        C1, C2, C3, C4 = np.broadcast_arrays(*[c.astype(np.int64, copy=False) for c in cols])
+        C1, C2, C3, C4 = (np.ravel(c) for c in (C1, C2, C3, C4))
+        if any((c < 0).any() for c in (C1, C2, C3, C4)):
+            raise ValueError("Inputs must be non-negative integers")
+
+        gcd = np.gcd(np.gcd(C1, C2), np.gcd(C3, C4))
+        gcd[gcd == 0] = 1
+        C1n, C2n, C3n, C4n = C1 // gcd, C2 // gcd, C3 // gcd, C4 // gcd
+
+        valid = (C2n != 0) & (C3n != 0)
+        # For non-negative x, y: x * y overflows iff x > MAX // y
+        overflow = (C1n > _INT64_MAX // np.maximum(C4n, 1)) | (C2n > _INT64_MAX // np.maximum(C3n, 1))
+        fast = valid & ~overflow
+
+        with np.errstate(over="ignore"):
+            num = np.where(fast, C1n * C4n, 0)
+            den = np.where(fast, C2n * C3n, 1)
+        g = np.gcd(num, den)
+        a = num // g
+        b = den // g
+        a[~valid] = 0
+        b[~valid] = 0
+
+        K = np.zeros(len(a), dtype=np.float64)
+        nz = fast & (a != 0)
+        K[nz] = 1.0 / (a[nz].astype(np.float64) * b[nz])
+
+        slow_rows = np.flatnonzero(valid & overflow)
+        if len(slow_rows):
+            slow = [TriadicRelationalFramework.discovery(int(C1[i]), int(C2[i]), int(C3[i]), int(C4[i]))
+                    for i in slow_rows]
+            if any(r.a > _INT64_MAX or r.b > _INT64_MAX for r in slow):
+                a, b = a.astype(object), b.astype(object)
+            for i, r in zip(slow_rows, slow):
+                a[i], b[i] = r.a, r.b
+                K[i] = float(r.simplicity)
+
+        return TriadicBatchResult(C4, K, a, b, valid)
     
     def generative(self, C1: int, C2: int, C3: int, a: int, b: int) -> TriadicResult:
         if b == 0 or C1 == 0:
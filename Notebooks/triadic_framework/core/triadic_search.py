@@ -1,24 +1,93 @@
-from itertools import permutations
-from typing import Tuple, Dict, Any, Optional
+"""
+triadic_search.py v2.0.0 – 2026-10-17
+UPDATE: Symmetry-aware search. C1·C4 = a/b·C2·C3 is invariant under C1<->C4, C2<->C3
+and swapping both pairs, so only the 3 distinct pairings are scored (instead of 24
+permutations), with early exit at K=1 and a bulk mode built on discovery_batch.
+"""
+
+import math
+from typing import Tuple, Dict, Any, Optional, List, Sequence
+import numpy as np
 from triadic_framework.core.triadic_engine import Triadic
-from fractions import Fraction
+
+# The three ways of splitting a quartet into {C1, C4} | {C2, C3}, each given as the
+# lexicographically first permutation realising it. Scanning them in this order and
+# keeping the first strictly better K reproduces the answer of the full 24-permutation
+# scan, including which ordering of the labels wins a tie.
+PAIRINGS: Tuple[Tuple[int, int, int, int], ...] = ((0, 1, 2, 3), (0, 1, 3, 2), (0, 2, 3, 1))
+
+def _result(a: int, b: int, order: Tuple[int, int, int, int], labels: Tuple[str, str, str, str]) -> Dict[str, Any]:
+    L1, L2, L3, L4 = (labels[i] for i in order)
+    return {
+        "K": 1 / (a * b),
+        "a/b": f"{a}/{b}",
+        "C1": L1, "C2": L2, "C3": L3, "C4": L4,
+        "equation": f"{L1} · {L4} = {a}/{b} · {L2} · {L3}"
+    }
 
 def auto_discover_best_triplet(values: Tuple[int, int, int, int], labels: Tuple[str, str, str, str] = ("A", "B", "C", "D")) -> Optional[Dict[str, Any]]:
-    best_k = Fraction(0)
+    # Same admissibility rules as Triadic.discovery: a zero always ends up either in
+    # C2/C3 (rejected) or in C1/C4 (K = 0, never an improvement).
+    if not all(isinstance(x, int) and x > 0 for x in values):
+        return None
+
+    gcd = math.gcd(*values)
+    v = [x // gcd for x in values]
+
+    best_ab = 0
     best = None
-    for perm_values, perm_labels in zip(permutations(values), permutations(labels)):
-        C1, C2, C3, C4 = perm_values
-        L1, L2, L3, L4 = perm_labels
-        try:
-            result = Triadic.discovery(C1, C2, C3, C4)
-            if result.simplicity > best_k:
-                best_k = result.simplicity
-                best = {
-                    "K": float(best_k),
-                    "a/b": f"{result.a}/{result.b}",
-                    "C1": L1, "C2": L2, "C3": L3, "C4": L4,
-                    "equation": f"{L1} · {L4} = {result.a}/{result.b} · {L2} · {L3}"
-                }
-        except ValueError:
-            continue
-    return best
+    for order in PAIRINGS:
+        i1, i2, i3, i4 = order
+        num = v[i1] * v[i4]
+        den = v[i2] * v[i3]
+        g = math.gcd(num, den)
+        a, b = num // g, den // g
+        if best is None or a * b < best_ab:
+            best_ab = a * b
+            best = (a, b, order)
+            if best_ab == 1:
+                break
+
+    a, b, order = best
+    return _result(a, b, order, labels)
+
+def auto_discover_best_triplets(values: Sequence[Tuple[int, int, int, int]], labels: Sequence[Tuple[str, str, str, str]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Bulk mode: one discovery_batch call per pairing over all quartets.
+    `values` may be a list of int tuples or an (N, 4) integer array; inputs that do
+    not fit an int64 table are handed to the scalar search row by row.
+    """
+    if len(values) != len(labels):
+        raise ValueError("values and labels must have the same length")
+    if not len(values):
+        return []
+
+    try:
+        table = np.asarray(values).reshape(-1, 4)
+    except (OverflowError, ValueError):
+        table = None
+    if table is None or table.dtype.kind not in "iu" or not np.can_cast(table.dtype, np.int64):
+        # Mixed types or integers beyond 64 bits: let the scalar search decide row by row
+        return [auto_discover_best_triplet(tuple(v), tuple(l)) for v, l in zip(values, labels)]
+    table = table.astype(np.int64, copy=False)
+    row_ok = (table > 0).all(axis=1)
+
+    # Ranked by the exact integer a·b, as in the scalar search (float K can tie for large a·b)
+    best_ab = np.zeros(len(table), dtype=object)
+    best_pairing = np.full(len(table), -1)
+    best_a = np.zeros(len(table), dtype=object)
+    best_b = np.zeros(len(table), dtype=object)
+    for p, order in enumerate(PAIRINGS):
+        res = Triadic.discovery_batch(*(table[:, i] for i in order))
+        ab = res.a.astype(object) * res.b.astype(object)
+        ok = row_ok & res.valid & (res.a != 0)
+        better = ok & ((best_pairing < 0) | (ab < best_ab).astype(bool))
+        best_ab[better] = ab[better]
+        best_pairing[better] = p
+        best_a[better] = res.a[better]
+        best_b[better] = res.b[better]
+
+    return [
+        _result(int(best_a[i]), int(best_b[i]), PAIRINGS[best_pairing[i]], tuple(labels[i])) if best_pairing[i] >= 0 else None
+        for i in range(len(table))
+    ]